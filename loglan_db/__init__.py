@@ -52,6 +52,16 @@ def app_lod(config_lod=CLIConfig, database=db):
     return create_app(config=config_lod, database=database)
 
 
+def init_worker_context(config=CLIConfig):
+    """
+    Initialize a worker process of a parallel job.
+    Every worker creates its own app, so it uses its own engine and connections
+    :param config: Database Config (should be picklable for process pools)
+    :return: None
+    """
+    app_lod(config_lod=config).app_context().push()
+
+
 def run_with_context(function):
     """Context Decorator"""
     def wrapper(*args, **kwargs):
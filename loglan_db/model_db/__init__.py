@@ -44,3 +44,6 @@ t_name_connect_words = "connect_words"
 
 t_name_connect_keys = "connect_keys"
 """`str` : `__tablename__` value for `t_connect_keys` table"""
+
+t_name_word_meanings = "word_meanings"
+"""`str` : `__tablename__` value for `HTMLWordMeaning` table"""
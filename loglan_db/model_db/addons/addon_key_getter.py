@@ -33,11 +33,11 @@ class AddonKeyGetter:
 
         """
         if not event_id:
-            event_id = BaseEvent.latest().id
+            event_id = BaseEvent.latest_id()
 
-        event_id = BaseEvent.id if isinstance(event_id, BaseEvent) else int(event_id)
+        event_id = event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
 
-        request = add_to if add_to else cls.query
+        request = add_to if add_to is not None else cls.query
         return cls._filter_event(event_id, request)
 
     @classmethod
@@ -38,11 +38,11 @@ class AddonWordGetter:
 
         """
         if not event_id:
-            event_id = BaseEvent.latest().id
+            event_id = BaseEvent.latest_id()
 
-        event_id = BaseEvent.id if isinstance(event_id, BaseEvent) else int(event_id)
+        event_id = event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
 
-        request = add_to if add_to else cls.query
+        request = add_to if add_to is not None else cls.query
         return cls._filter_event(event_id, request).order_by(cls.name)
 
     @staticmethod
@@ -65,10 +65,11 @@ class AddonWordGetter:
 
         """
 
-        request = add_to if add_to else cls.query
+        request = add_to if add_to is not None else cls.query
         name = name.replace("*", "%")
         return cls.by_event(event_id, request).filter(
-            BaseWord.name.like(name) if case_sensitive else BaseWord.name.ilike(name)
+            BaseWord.name.like(name) if case_sensitive
+            else db.func.lower(BaseWord.name).like(name.lower())
         )
 
     @classmethod
@@ -87,12 +88,13 @@ class AddonWordGetter:
 
         """
 
-        request = add_to if add_to else cls.query
+        request = add_to if add_to is not None else cls.query
         request = cls.by_event(event_id, request)
 
-        key = (BaseKey.word if isinstance(key, BaseKey) else str(key)).replace("*", "%")
-        request = request.join(BaseDefinition, t_connect_keys, BaseKey).filter(
-            BaseKey.word.like(key) if case_sensitive else BaseKey.word.ilike(key))
+        key = (key.word if isinstance(key, BaseKey) else str(key)).replace("*", "%")
+        request = request.join(BaseDefinition).join(t_connect_keys).join(BaseKey).filter(
+            BaseKey.word.like(key) if case_sensitive
+            else db.func.lower(BaseKey.word).like(key.lower()))
 
         if language:
             request = request.filter(BaseKey.language == language)
@@ -2,21 +2,98 @@
 """
 This module contains an addon for basic Word Model,
 which makes it possible to specify the authors and derivatives of words
+
+Links are added with one id-only query for existing pairs
+and one executemany for missing pairs, see `AddonWordLinker.link_derivatives`.
+Linked words are marked with `mark_words_changed`. Nothing is committed.
 """
-from typing import List
+from typing import Iterable, List, Set, Tuple
 
 from flask_sqlalchemy import BaseQuery
+from sqlalchemy import Table
 
+from loglan_db import db
 from loglan_db.model_db.base_author import BaseAuthor
-from loglan_db.model_db.base_connect_tables import t_connect_words
+from loglan_db.model_db.base_connect_tables import t_connect_authors, t_connect_words, \
+    mark_words_changed
 from loglan_db.model_db.base_word import BaseWord
 
+QUERY_BATCH_SIZE = 500
+"""Maximum number of ids in one IN clause"""
+
+
+def _insert_missing_pairs(
+        table: Table, columns: Tuple[str, str],
+        pairs: Iterable[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """
+    Insert pairs of ids, which do not exist in the connecting table yet
+    Args:
+        table: Connecting table
+        columns: Names of the table's columns for the first and the second id
+        pairs: Pairs of ids
+    Returns:
+        Inserted pairs
+    """
+    pairs = set(pairs)
+    if not pairs:
+        return pairs
+
+    first, second = table.c[columns[0]], table.c[columns[1]]
+    first_ids = sorted({first_id for first_id, _ in pairs})
+    for start in range(0, len(first_ids), QUERY_BATCH_SIZE):
+        pairs -= set(db.session.query(first, second).filter(
+            first.in_(first_ids[start:start + QUERY_BATCH_SIZE])))
+
+    if pairs:
+        db.session.execute(table.insert(), [
+            dict(zip(columns, pair)) for pair in sorted(pairs)])
+    return pairs
+
+
+def _flush_if_transient(*objects) -> None:
+    """
+    Flush the session if some objects do not have ids yet
+    """
+    if any(obj.id is None for obj in objects):
+        db.session.flush()
+
 
 class AddonWordLinker:
     """AddonWordLinker Model"""
+    id: db.Column
     _derivatives: BaseQuery = None
     authors: BaseQuery = None
 
+    @staticmethod
+    def link_derivatives(pairs: Iterable[Tuple[int, int]]) -> int:
+        """Link words with their derivatives, skipping pairs that were previously linked
+
+        Args:
+          pairs: Iterable[Tuple[int, int]]: Pairs of (parent_id, child_id)
+
+        Returns:
+          Number of added links
+
+        """
+        inserted = _insert_missing_pairs(t_connect_words, ("parent_id", "child_id"), pairs)
+        mark_words_changed(word_id for pair in inserted for word_id in pair)
+        return len(inserted)
+
+    @staticmethod
+    def link_authors(pairs: Iterable[Tuple[int, int]]) -> int:
+        """Link authors with words, skipping pairs that were previously linked
+
+        Args:
+          pairs: Iterable[Tuple[int, int]]: Pairs of (AID, WID)
+
+        Returns:
+          Number of added links
+
+        """
+        inserted = _insert_missing_pairs(t_connect_authors, ("AID", "WID"), pairs)
+        mark_words_changed(word_id for _, word_id in inserted)
+        return len(inserted)
+
     def _is_parented(self, child: BaseWord) -> bool:
         """
         Check, if this word is already added as a parent for this 'child'
@@ -41,8 +118,7 @@ class AddonWordLinker:
 
         """
         # TODO add check if type of child is allowed to add to this word
-        if not self._is_parented(child):
-            self._derivatives.append(child)
+        self.add_children([child, ])
         return child.name
 
     def add_children(self, children: List[BaseWord]):
@@ -57,8 +133,8 @@ class AddonWordLinker:
 
         """
         # TODO add check if type of child is allowed to add to this word
-        new_children = list(set(children) - set(self._derivatives))
-        _ = self._derivatives.extend(new_children) if new_children else None
+        _flush_if_transient(self, *children)
+        self.link_derivatives((self.id, child.id) for child in children)
 
     def add_author(self, author: BaseAuthor) -> str:
         """Connect Author object with BaseWord object
@@ -69,8 +145,7 @@ class AddonWordLinker:
         Returns:
 
         """
-        if not self.authors.filter(BaseAuthor.abbreviation == author.abbreviation).count() > 0:
-            self.authors.append(author)
+        self.add_authors([author, ])
         return author.abbreviation
 
     def add_authors(self, authors: List[BaseAuthor]):
@@ -82,5 +157,5 @@ class AddonWordLinker:
         Returns:
 
         """
-        new_authors = list(set(authors) - set(self.authors))
-        _ = self.authors.extend(new_authors) if new_authors else None
+        _flush_if_transient(self, *authors)
+        self.link_authors((author.id, self.id) for author in authors)
@@ -2,14 +2,26 @@
 """
 This module contains an addon for basic Word Model,
 which makes it possible to work with word's sources
+
+The whole derivative graph (`t_connect_words`) can be rebuilt
+from origins of all complexes with `AddonWordSourcer.build_derivative_graph`.
+
+<details><summary>Show Examples</summary><p>
+```python
+Word.build_derivative_graph()
+# {'added': 12, 'removed': 1}
+```
+</p></details>
 """
 
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Set, Tuple, Union
 from flask_sqlalchemy import BaseQuery
+from sqlalchemy import bindparam
 
+from loglan_db.model_db.base_connect_tables import t_connect_words, mark_words_changed
 from loglan_db.model_db.base_type import BaseType
 from loglan_db.model_db.base_word import BaseWord
-from loglan_db import db
+from loglan_db import db, log
 from loglan_db.model_db.base_word_source import BaseWordSource
 
 
@@ -21,6 +33,7 @@ class AddonWordSourcer:
     origin: db.Column
     origin_x: db.Column
     type_id: db.Column
+    id: db.Column
     query: BaseQuery
 
     def get_sources_prim(self):
@@ -85,7 +98,7 @@ class AddonWordSourcer:
         Returns:
 
         """
-        exclude_type_ids = [t.id for t in BaseType.by(["LW", "Cpd"]).all()]
+        exclude_type_ids = BaseType.registry.ids(["LW", "Cpd"])
         return cls.query \
             .filter(cls.name.in_(sources)) \
             .filter(cls.type_id.notin_(exclude_type_ids)).all()
@@ -94,7 +107,17 @@ class AddonWordSourcer:
         """
         Returns:
         """
-        sources = self.origin.replace("(", "").replace(")", "").replace("/", "")
+        return self._parse_sources_cpx(self.origin)
+
+    @staticmethod
+    def _parse_sources_cpx(origin: str) -> List[str]:
+        """
+        Args:
+            origin: Origin of the Cpx word
+        Returns:
+            Names of source words
+        """
+        sources = origin.replace("(", "").replace(")", "").replace("/", "")
         sources = sources.split("+")
         sources = [
             s if not s.endswith(("r", "h")) else s[:-1]
@@ -122,7 +145,17 @@ class AddonWordSourcer:
         """
         Returns:
         """
-        sources = self.origin.replace("(", "").replace(")", "").replace("/", "").replace("-", "")
+        return self._parse_sources_cpd(self.origin)
+
+    @staticmethod
+    def _parse_sources_cpd(origin: str) -> List[str]:
+        """
+        Args:
+            origin: Origin of the Cpd word
+        Returns:
+            Names of source words
+        """
+        sources = origin.replace("(", "").replace(")", "").replace("/", "").replace("-", "")
         sources = [s.strip() for s in sources.split("+") if s]
         return sources
 
@@ -136,6 +169,85 @@ class AddonWordSourcer:
         Returns:
 
         """
-        type_ids = [t.id for t in BaseType.by(["LW", "Cpd"]).all()]
+        type_ids = BaseType.registry.ids(["LW", "Cpd"])
         return cls.query.filter(cls.name.in_(sources)) \
             .filter(cls.type_id.in_(type_ids)).all()
+
+    @classmethod
+    def _derivative_graph(cls) -> Tuple[Set[int], Set[Tuple[int, int]]]:
+        """
+        Parse origins of all Cpx and Cpd words in memory
+        with the same rules as `get_sources_cpx` and `get_sources_cpd`
+        Returns:
+            Ids of complexes with parsed origins and set of (parent_id, child_id)
+        """
+        cpx_type_ids = set(BaseType.registry.ids_matching(word_group="Cpx"))
+        cpd_type_ids = set(BaseType.registry.ids_matching(word_type="Cpd"))
+        cpd_source_type_ids = set(BaseType.registry.ids(["LW", "Cpd"]))
+
+        names: Dict[str, List[Tuple[int, int]]] = {}
+        complexes = []
+        for word_id, name, type_id, origin in db.session.query(
+                cls.id, cls.name, cls.type_id, cls.origin):
+            names.setdefault(name, []).append((word_id, type_id))
+            if type_id in cpx_type_ids or type_id in cpd_type_ids:
+                complexes.append((word_id, type_id, origin))
+
+        parsed, edges = set(), set()
+        for word_id, type_id, origin in complexes:
+            if not origin:
+                continue
+            is_cpd = type_id in cpd_type_ids
+            sources = cls._parse_sources_cpd(origin) if is_cpd else cls._parse_sources_cpx(origin)
+            if not sources:
+                continue
+            parsed.add(word_id)
+            edges.update(
+                (parent_id, word_id) for source in sources
+                for parent_id, parent_type_id in names.get(source, ())
+                if (parent_type_id in cpd_source_type_ids) == is_cpd)
+        return parsed, edges
+
+    @classmethod
+    def derivative_edges(cls) -> Set[Tuple[int, int]]:
+        """
+        Get the complete derivative graph of the dictionary from origins
+        of all Cpx and Cpd words, loading words and types only once
+        Returns:
+            Set of (parent_id, child_id)
+        """
+        return cls._derivative_graph()[1]
+
+    @classmethod
+    def build_derivative_graph(cls) -> Dict[str, int]:
+        """
+        Diff the derivative graph built from origins against `t_connect_words`
+        and apply changes with one executemany for added and removed links.
+        Only links of Cpx and Cpd children with parsed origins are removed,
+        other links are kept. Words of changed links are marked with
+        `mark_words_changed`. Changes are committed.
+        Returns:
+            Dictionary with numbers of "added" and "removed" links
+        """
+        complexes, edges = cls._derivative_graph()
+        existing = set(db.session.query(t_connect_words.c.parent_id, t_connect_words.c.child_id))
+        to_add = sorted(edges - existing)
+        to_remove = sorted(edge for edge in existing - edges if edge[1] in complexes)
+
+        try:
+            if to_remove:
+                db.session.execute(t_connect_words.delete().where(
+                    t_connect_words.c.parent_id == bindparam("parent"),
+                    t_connect_words.c.child_id == bindparam("child")),
+                    [{"parent": parent, "child": child} for parent, child in to_remove])
+            if to_add:
+                db.session.execute(t_connect_words.insert(), [
+                    {"parent_id": parent, "child_id": child} for parent, child in to_add])
+            mark_words_changed(word_id for edge in to_add + to_remove for word_id in edge)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        log.info("Derivative graph of %d complexes: %d links added, %d removed",
+                 len(complexes), len(to_add), len(to_remove))
+        return {"added": len(to_add), "removed": len(to_remove)}
@@ -3,6 +3,8 @@
 """
 This module contains a basic Connection Table Models
 """
+from typing import Iterable
+
 from loglan_db import db
 from loglan_db.model_db import t_name_connect_authors, \
     t_name_authors, t_name_words, t_name_connect_words, \
@@ -12,7 +14,8 @@ from loglan_db.model_db import t_name_connect_authors, \
 t_connect_authors = db.Table(
     t_name_connect_authors, db.metadata,
     db.Column('AID', db.ForeignKey(f'{t_name_authors}.id'), primary_key=True),
-    db.Column('WID', db.ForeignKey(f'{t_name_words}.id'), primary_key=True), )
+    db.Column('WID', db.ForeignKey(f'{t_name_words}.id'), primary_key=True),
+    db.Index(f'ix_{t_name_connect_authors}_WID', 'WID'), )
 """`(sqlalchemy.sql.schema.Table)`: 
 Connecting table for "many-to-many" relationship 
 between `BaseAuthor` and `BaseWord` objects"""
@@ -20,7 +23,8 @@ between `BaseAuthor` and `BaseWord` objects"""
 t_connect_words = db.Table(
     t_name_connect_words, db.metadata,
     db.Column('parent_id', db.ForeignKey(f'{t_name_words}.id'), primary_key=True),
-    db.Column('child_id', db.ForeignKey(f'{t_name_words}.id'), primary_key=True), )
+    db.Column('child_id', db.ForeignKey(f'{t_name_words}.id'), primary_key=True),
+    db.Index(f'ix_{t_name_connect_words}_child_id', 'child_id'), )
 """`(sqlalchemy.sql.schema.Table)`: 
 Connecting table for "many-to-many" relationship 
 (parent-child) between `BaseWord` objects"""
@@ -28,7 +32,23 @@ Connecting table for "many-to-many" relationship
 t_connect_keys = db.Table(
     t_name_connect_keys, db.metadata,
     db.Column('KID', db.ForeignKey(f'{t_name_keys}.id'), primary_key=True),
-    db.Column('DID', db.ForeignKey(f'{t_name_definitions}.id'), primary_key=True), )
+    db.Column('DID', db.ForeignKey(f'{t_name_definitions}.id'), primary_key=True),
+    db.Index(f'ix_{t_name_connect_keys}_DID', 'DID'), )
 """`(sqlalchemy.sql.schema.Table)`: 
 Connecting table for "many-to-many" relationship 
 between `BaseDefinition` and `BaseKey` objects"""
+
+CHANGED_WORDS_KEY = "loglan_db_changed_words"
+"""Key of `Session.info` for words, which links were written with Core statements"""
+
+
+def mark_words_changed(word_ids: Iterable[int]) -> None:
+    """
+    Mark words, which rows in connecting tables were inserted or deleted
+    with Core statements. Such statements bypass ORM flush events,
+    so data built from words' links (see `loglan_db.model_html.html_meaning`)
+    is rebuilt for marked words on the next flush or commit.
+    Args:
+        word_ids: Ids of changed words
+    """
+    db.session.info.setdefault(CHANGED_WORDS_KEY, set()).update(word_ids)
@@ -3,10 +3,13 @@
 This module contains a basic Definition Model
 """
 import re
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 from flask_sqlalchemy import BaseQuery
-from sqlalchemy import exists
+from sqlalchemy import bindparam, event, exists, inspect, tuple_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
 
 from loglan_db import db
 from loglan_db.model_db import t_name_definitions, t_name_words
@@ -19,6 +22,14 @@ __pdoc__ = {
     'BaseDefinition.created': False, 'BaseDefinition.updated': False,
 }
 
+_UPSERT_INSERTS = {
+    "postgresql": postgresql_insert,
+    "sqlite": sqlite_insert,
+}
+
+KEYS_SYNC_KEY = "loglan_db_keys_sync"
+"""Key of `Session.info` for keys of definitions changed in the current flush"""
+
 
 class BaseDefinition(db.Model, InitBase, DBBase):
     """BaseDefinition model"""
@@ -27,7 +38,7 @@ class BaseDefinition(db.Model, InitBase, DBBase):
     id = db.Column(db.Integer, primary_key=True)
     """Definition's internal ID number: Integer"""
 
-    word_id = db.Column(db.Integer, db.ForeignKey(f'{t_name_words}.id'), nullable=False)
+    word_id = db.Column(db.Integer, db.ForeignKey(f'{t_name_words}.id'), nullable=False, index=True)
     position = db.Column(db.Integer, nullable=False)
     usage = db.Column(db.String(64))
     grammar_code = db.Column(db.String(8))
@@ -40,6 +51,9 @@ class BaseDefinition(db.Model, InitBase, DBBase):
     APPROVED_CASE_TAGS = ["B", "C", "D", "F", "G", "J", "K", "N", "P", "S", "V", ]
     KEY_PATTERN = r"(?<=\«)(.+?)(?=\»)"
 
+    sync_keys = True
+    """*Whether links with keys are re-synced when the body or the language is changed*"""
+
     _keys = db.relationship(
         BaseKey.__name__, secondary=t_connect_keys,
         back_populates="_definitions", lazy='dynamic')
@@ -78,13 +92,17 @@ class BaseDefinition(db.Model, InitBase, DBBase):
 
     def link_keys_from_list_of_str(
             self, source: List[str],
-            language: str = None) -> List[BaseKey]:
+            language: str = None, create_missing: bool = False) -> List[BaseKey]:
         """Linking a list of vernacular words with BaseDefinition
         Only new words will be linked, skipping those that were previously linked
+        or are already appended to the definition's keys within the session
 
         Args:
           source: List[str]: List of words on vernacular language
           language: str: Language of source words (Default value = None)
+          create_missing: bool: Insert keys, which do not exist yet, with one
+            INSERT ... ON CONFLICT DO NOTHING statement before the query of keys
+            to link (Default value = False)
 
         Returns:
           List of linked BaseKey objects
@@ -93,15 +111,66 @@ class BaseDefinition(db.Model, InitBase, DBBase):
 
         language = language if language else self.language
 
+        if create_missing:
+            self.insert_missing_keys(source=source, language=language)
+
         new_keys = BaseKey.query.filter(
             BaseKey.word.in_(source),
             BaseKey.language == language,
             ~exists().where(BaseKey.id == self.keys.subquery().c.id),
         ).all()
+        pending = set(inspect(self).attrs._keys.history.added)
+        new_keys = [key for key in new_keys if key not in pending]
 
         self.keys.extend(new_keys)
         return new_keys
 
+    @classmethod
+    def body_keys(cls, body: Optional[str], language: Optional[str]) -> Set[Tuple[str, str]]:
+        """Extract keys from the definition's body
+
+        Args:
+          body: Optional[str]: Body of the definition
+          language: Optional[str]: Language of the definition
+
+        Returns:
+          Set of (key word, language)
+
+        """
+        if not body or not language:
+            return set()
+        return {(word, language) for word in re.findall(cls.KEY_PATTERN, body)}
+
+    @staticmethod
+    def insert_missing_keys(source: List[str], language: str) -> None:
+        """Insert keys, which do not exist yet, without committing
+        INSERT ... ON CONFLICT DO NOTHING is used on PostgreSQL and SQLite,
+        other dialects insert keys, which are not found by a query
+
+        Args:
+          source: List[str]: List of words on vernacular language
+          language: str: Language of source words
+
+        Returns:
+          None
+
+        """
+        rows = [{"word": word, "language": language} for word in dict.fromkeys(source)]
+        if not rows:
+            return
+
+        insert = _UPSERT_INSERTS.get(db.engine.dialect.name)
+        if insert:
+            db.session.execute(insert(BaseKey.__table__).values(rows).on_conflict_do_nothing(
+                index_elements=[BaseKey.word, BaseKey.language]))
+            return
+
+        existing = {word for (word, ) in db.session.query(BaseKey.word).filter(
+            BaseKey.word.in_(source), BaseKey.language == language)}
+        rows = [row for row in rows if row["word"] not in existing]
+        if rows:
+            db.session.execute(BaseKey.__table__.insert(), rows)
+
     def link_key_from_str(self, word: str, language: str = None) -> Optional[BaseKey]:
         """Linking vernacular word with BaseDefinition object
         Only new word will be linked, skipping this that was previously linked
@@ -199,4 +268,61 @@ class BaseDefinition(db.Model, InitBase, DBBase):
             request = request.filter(BaseKey.language == language)
 
         return request.filter(
-            BaseKey.word.like(key) if case_sensitive else BaseKey.word.ilike(key))
+            BaseKey.word.like(key) if case_sensitive
+            else db.func.lower(BaseKey.word).like(key.lower()))
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changed_keys(session: Session, *_) -> None:
+    if not BaseDefinition.sync_keys:
+        return
+    changed = {obj.id: obj for obj in session.dirty if isinstance(obj, BaseDefinition)
+               and obj.id is not None and session.is_modified(obj)
+               and any(inspect(obj).attrs[name].history.has_changes()
+                       for name in ("body", "language"))}
+    if not changed:
+        return
+
+    with session.no_autoflush:
+        old_values = session.query(
+            BaseDefinition.id, BaseDefinition.body, BaseDefinition.language) \
+            .filter(BaseDefinition.id.in_(changed))
+        changes = session.info.setdefault(KEYS_SYNC_KEY, {})
+        for definition_id, body, language in old_values:
+            obj = changed[definition_id]
+            changes[definition_id] = (
+                BaseDefinition.body_keys(body, language),
+                BaseDefinition.body_keys(obj.body, obj.language))
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _sync_changed_keys(session: Session, _) -> None:
+    changes: Dict[int, Tuple[Set, Set]] = session.info.pop(KEYS_SYNC_KEY, None)
+    if not changes:
+        return
+
+    removed = {(did, key) for did, (old, new) in changes.items() for key in old - new}
+    added = {(did, key) for did, (old, new) in changes.items() for key in new - old}
+    if not removed and not added:
+        return
+
+    for language in {language for _, (_, language) in added}:
+        BaseDefinition.insert_missing_keys(
+            [word for _, (word, key_language) in sorted(added) if key_language == language],
+            language)
+
+    keys = {key for _, key in removed | added}
+    key_ids = {(word, language): key_id for key_id, word, language in session.query(
+        BaseKey.id, BaseKey.word, BaseKey.language).filter(
+        tuple_(BaseKey.word, BaseKey.language).in_(sorted(keys)))}
+    links = set(session.query(t_connect_keys.c.KID, t_connect_keys.c.DID).filter(
+        t_connect_keys.c.DID.in_(changes)))
+
+    to_remove = sorted({(key_ids[key], did) for did, key in removed if key in key_ids} & links)
+    to_add = sorted({(key_ids[key], did) for did, key in added} - links)
+    if to_remove:
+        session.execute(t_connect_keys.delete().where(
+            t_connect_keys.c.KID == bindparam("kid"), t_connect_keys.c.DID == bindparam("did")),
+            [{"kid": kid, "did": did} for kid, did in to_remove])
+    if to_add:
+        session.execute(t_connect_keys.insert(), [{"KID": kid, "DID": did} for kid, did in to_add])
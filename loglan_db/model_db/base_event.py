@@ -5,6 +5,15 @@
 This module contains a basic Event Model
 """
 from __future__ import annotations
+
+import threading
+import time
+from itertools import chain
+from typing import Callable, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
 from loglan_db import db
 from loglan_db.model_db import t_name_events
 from loglan_db.model_init import InitBase, DBBase
@@ -14,6 +23,66 @@ __pdoc__ = {
 }
 
 
+class LatestEventCache:
+    """Process-wide cache of the latest (current) `BaseEvent`'s id
+
+    It is invalidated when a transaction, which inserted or deleted any `BaseEvent`,
+    is committed, on any rollback and when the events table is created or dropped.
+    A value loaded before the latest invalidation is returned, but not stored.
+    Set `ttl` (in seconds) to limit the lifetime of a cached value,
+    when other processes can add events to the same database.
+    """
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        """*Lifetime of the cached value in seconds, None means forever*"""
+        self.hits = 0
+        """*Number of requests served from the cache*"""
+        self.misses = 0
+        """*Number of requests served from DB*"""
+        self._value: Optional[int] = None
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _is_valid(self) -> bool:
+        if self._value is None:
+            return False
+        return self.ttl is None or time.monotonic() - self._loaded_at < self.ttl
+
+    def get(self, loader: Callable[[], Optional[int]]) -> Optional[int]:
+        """
+        Get cached value or load it with the `loader` function
+        """
+        with self._lock:
+            if self._is_valid():
+                self.hits += 1
+                return self._value
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._value, self._loaded_at = value, time.monotonic()
+        return value
+
+    def invalidate(self) -> None:
+        """
+        Drop the cached value
+        """
+        with self._lock:
+            self._value = None
+            self._generation += 1
+
+    def info(self) -> dict:
+        """
+        Get the cache statistics
+        """
+        return {"hits": self.hits, "misses": self.misses,
+                "ttl": self.ttl, "value": self._value, }
+
+
 class BaseEvent(db.Model, InitBase, DBBase):
     """Base Event's DB Model
 
@@ -52,6 +121,9 @@ class BaseEvent(db.Model, InitBase, DBBase):
     """*Event's suffix (used to create filename when exporting HTML file)*  
         **str** : max_length=16, nullable=False, unique=False"""
 
+    latest_cache = LatestEventCache()
+    """*Cache of the latest event's id, see `LatestEventCache`*"""
+
     _deprecated_words = db.relationship(
         "BaseWord", back_populates="_event_end",
         foreign_keys="BaseWord.event_end_id")
@@ -78,9 +150,46 @@ class BaseEvent(db.Model, InitBase, DBBase):
 
         return self._appeared_words
 
+    @classmethod
+    def latest_id(cls) -> Optional[int]:
+        """
+        Gets the id of the latest (current) `BaseEvent` from cache or DB
+        """
+        return cls.latest_cache.get(
+            lambda: db.session.query(func.max(BaseEvent.id)).scalar())
+
     @classmethod
     def latest(cls) -> BaseEvent:
         """
         Gets the latest (current) `BaseEvent` from DB
         """
-        return cls.query.order_by(-cls.id).first()
+        latest_id = cls.latest_id()
+        return cls.query.get(latest_id) if latest_id is not None else None
+
+
+EVENTS_CHANGED_KEY = "loglan_db_events_changed"
+"""Key of `Session.info` marking that events were added or deleted in the current transaction"""
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_events(session: Session, _) -> None:
+    if any(isinstance(obj, BaseEvent) for obj in chain(session.new, session.deleted)):
+        session.info[EVENTS_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_latest_event(session: Session) -> None:
+    if session.info.pop(EVENTS_CHANGED_KEY, False):
+        BaseEvent.latest_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _invalidate_latest_event_on_rollback(session: Session) -> None:
+    session.info.pop(EVENTS_CHANGED_KEY, None)
+    BaseEvent.latest_cache.invalidate()
+
+
+@event.listens_for(BaseEvent.__table__, "after_create")
+@event.listens_for(BaseEvent.__table__, "after_drop")
+def _invalidate_latest_event_on_ddl(*_, **__) -> None:
+    BaseEvent.latest_cache.invalidate()
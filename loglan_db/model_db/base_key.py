@@ -57,3 +57,9 @@ class BaseKey(db.Model, InitBase, DBBase):
     @property
     def definitions(self):
         return self._definitions
+
+
+# Functional index for case-insensitive search by key word, see AddonWordGetter.by_key
+db.Index(
+    f"ix_{t_name_keys}_word_lower", db.func.lower(BaseKey.word).label("word_lower"),
+    postgresql_ops={"word_lower": "text_pattern_ops"})
@@ -3,6 +3,8 @@
 """
 This module contains a basic Setting Model
 """
+from typing import Optional
+
 from loglan_db import db
 from loglan_db.model_db import t_name_settings
 from loglan_db.model_init import InitBase, DBBase
@@ -42,3 +44,10 @@ class BaseSetting(db.Model, InitBase, DBBase):
     db_release = db.Column(db.String(16), nullable=False)
     """*Database release (for new application)*  
             **str** : max_length=16, nullable=False, unique=True"""
+
+    @classmethod
+    def latest_version(cls) -> Optional[int]:
+        """
+        Get db_version of the latest setting or None if there are no settings
+        """
+        return db.session.query(cls.db_version).order_by(cls.id.desc()).limit(1).scalar()
@@ -2,10 +2,14 @@
 """
 This module contains a basic Type Model
 """
-from typing import Union, List
+import threading
+import time
+from itertools import chain
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple, Union
 
 from flask_sqlalchemy import BaseQuery
-from sqlalchemy import or_
+from sqlalchemy import event
+from sqlalchemy.orm import Session
 
 from loglan_db import db
 from loglan_db.model_db import t_name_types
@@ -17,6 +21,102 @@ __pdoc__ = {
 }
 
 
+class TypeRecord(NamedTuple):
+    """Lightweight copy of the `BaseType` row"""
+    id: int
+    type: str
+    type_x: str
+    group: Optional[str]
+
+
+class TypeRegistry:
+    """In-process registry of all types indexed by `type`, `type_x` and `group`
+
+    The types table is small and almost never changes, so it is loaded once
+    and reloaded only after a transaction, which changed any `BaseType`,
+    is committed or rolled back, or the types table is created or dropped.
+    Set `ttl` (in seconds) to limit the lifetime of loaded types,
+    when other processes can change types in the same database.
+    Like `LatestEventCache`, types loaded before the latest invalidation
+    are not stored, so a slow reload cannot bring back stale types.
+    """
+    FIELDS = ("type", "type_x", "group")
+
+    def __init__(self, ttl: Optional[float] = None):
+        self.ttl = ttl
+        """*Lifetime of loaded types in seconds, None means forever*"""
+        self._records: Optional[Dict[int, TypeRecord]] = None
+        self._index: Dict[str, Dict[str, Set[int]]] = {}
+        self._loaded_at = 0.0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _is_valid(self) -> bool:
+        if self._records is None:
+            return False
+        return self.ttl is None or time.monotonic() - self._loaded_at < self.ttl
+
+    def _load(self) -> Tuple[Dict[int, TypeRecord], Dict[str, Dict[str, Set[int]]]]:
+        """
+        Get loaded types and their index, load them if needed.
+        Types loaded before the latest invalidation are returned, but not stored.
+        """
+        with self._lock:
+            if self._is_valid():
+                return self._records, self._index
+            generation = self._generation
+
+        records = {row.id: TypeRecord(*row) for row in db.session.query(
+            BaseType.id, BaseType.type, BaseType.type_x, BaseType.group)}
+        index = {field: {} for field in self.FIELDS}
+        for record in records.values():
+            for field in self.FIELDS:
+                index[field].setdefault(getattr(record, field), set()).add(record.id)
+
+        with self._lock:
+            if generation == self._generation:
+                self._records, self._index = records, index
+                self._loaded_at = time.monotonic()
+        return records, index
+
+    def get(self, type_id: int) -> Optional[TypeRecord]:
+        """
+        Get type by its id
+        """
+        return self._load()[0].get(type_id)
+
+    def ids(self, type_filter: Union[str, List[str]]) -> List[int]:
+        """
+        Get ids of types, which type, type_x or group is in type_filter
+        The same as `BaseType.by`, but without any query to DB
+        """
+        _, index = self._load()
+        type_filter = [type_filter, ] if isinstance(type_filter, str) else type_filter
+        return sorted(set(chain.from_iterable(
+            index[field].get(value, ()) for field in self.FIELDS for value in type_filter)))
+
+    def ids_matching(
+            self, word_type: str = None, word_type_x: str = None,
+            word_group: str = None) -> List[int]:
+        """
+        Get ids of types, which match all specified values
+        """
+        records, index = self._load()
+        result = set(records)
+        for field, value in zip(self.FIELDS, (word_type, word_type_x, word_group)):
+            if value:
+                result &= index[field].get(value, set())
+        return sorted(result)
+
+    def invalidate(self) -> None:
+        """
+        Drop loaded types, they will be reloaded on the next request
+        """
+        with self._lock:
+            self._records, self._index = None, {}
+            self._generation += 1
+
+
 class BaseType(db.Model, InitBase, DBBase):
     """BaseType model"""
     __tablename__ = t_name_types
@@ -30,6 +130,9 @@ class BaseType(db.Model, InitBase, DBBase):
     parentable = db.Column(db.Boolean, nullable=False)  # E.g. True, False
     description = db.Column(db.String(255))  # E.g. Two-term Complex, ...
 
+    registry = TypeRegistry()
+    """In-process registry of types, see `TypeRegistry`"""
+
     _words = db.relationship(
         "BaseWord", back_populates="_type",
         foreign_keys="BaseWord.type_id")
@@ -48,7 +151,33 @@ class BaseType(db.Model, InitBase, DBBase):
         Returns:
 
         """
-        type_filter = [type_filter, ] if isinstance(type_filter, str) else type_filter
+        return cls.query.filter(cls.id.in_(cls.registry.ids(type_filter)))
+
+
+TYPES_CHANGED_KEY = "loglan_db_types_changed"
+"""Key of `Session.info` marking that types were changed in the current transaction"""
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_types(session: Session, _) -> None:
+    if any(isinstance(obj, BaseType) for obj in chain(
+            session.new, session.dirty, session.deleted)):
+        session.info[TYPES_CHANGED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_type_registry(session: Session) -> None:
+    if session.info.pop(TYPES_CHANGED_KEY, False):
+        BaseType.registry.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _invalidate_type_registry_on_rollback(session: Session, _) -> None:
+    if session.info.pop(TYPES_CHANGED_KEY, False):
+        BaseType.registry.invalidate()
+
 
-        return cls.query.filter(or_(
-            cls.type.in_(type_filter), cls.type_x.in_(type_filter), cls.group.in_(type_filter), ))
+@event.listens_for(BaseType.__table__, "after_create")
+@event.listens_for(BaseType.__table__, "after_drop")
+def _invalidate_type_registry_on_ddl(*_, **__) -> None:
+    BaseType.registry.invalidate()
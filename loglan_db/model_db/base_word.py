@@ -31,7 +31,7 @@ class BaseWord(db.Model, InitBase, DBBase):
 
     id = db.Column(db.Integer, primary_key=True)
     """Word's internal ID number: Integer"""
-    name = db.Column(db.String(64), nullable=False)
+    name = db.Column(db.String(64), nullable=False, index=True)
     origin = db.Column(db.String(128))
     origin_x = db.Column(db.String(64))
     match = db.Column(db.String(8))
@@ -44,17 +44,17 @@ class BaseWord(db.Model, InitBase, DBBase):
     TID_old = db.Column(db.Integer)  # references
 
     # Relationships
-    type_id = db.Column("type", db.ForeignKey(f'{t_name_types}.id'), nullable=False)
+    type_id = db.Column("type", db.ForeignKey(f'{t_name_types}.id'), nullable=False, index=True)
     _type: BaseType = db.relationship(
         BaseType.__name__, back_populates="_words")
 
     event_start_id = db.Column(
-        "event_start", db.ForeignKey(f'{t_name_events}.id'), nullable=False)
+        "event_start", db.ForeignKey(f'{t_name_events}.id'), nullable=False, index=True)
     _event_start: BaseEvent = db.relationship(
         BaseEvent.__name__, foreign_keys=[event_start_id],
         back_populates="_appeared_words")
 
-    event_end_id = db.Column("event_end", db.ForeignKey(f'{t_name_events}.id'))
+    event_end_id = db.Column("event_end", db.ForeignKey(f'{t_name_events}.id'), index=True)
     _event_end: BaseEvent = db.relationship(
         BaseEvent.__name__, foreign_keys=[event_end_id],
         back_populates="_deprecated_words")
@@ -117,16 +117,13 @@ class BaseWord(db.Model, InitBase, DBBase):
             BaseQuery
         """
 
-        type_values = [
-                (BaseType.type, word_type),
-                (BaseType.type_x, word_type_x),
-                (BaseType.group, word_group), ]
+        request = self._derivatives.filter(self.id == t_connect_words.c.parent_id)
 
-        type_filters = [i[0] == i[1] for i in type_values if i[1]]
+        if word_type or word_type_x or word_group:
+            type_ids = BaseType.registry.ids_matching(word_type, word_type_x, word_group)
+            request = request.filter(BaseWord.type_id.in_(type_ids))
 
-        return self._derivatives.join(BaseType)\
-            .filter(self.id == t_connect_words.c.parent_id, *type_filters)\
-            .order_by(type(self).name.asc())
+        return request.order_by(type(self).name.asc())
 
     @property
     def parents(self) -> BaseQuery:
@@ -171,3 +168,9 @@ class BaseWord(db.Model, InitBase, DBBase):
         """
         return BaseKey.query.join(
             t_connect_keys, BaseDefinition, BaseWord).filter(BaseWord.id == self.id)
+
+
+# Functional index for case-insensitive search by name, see AddonWordGetter.by_name
+db.Index(
+    f"ix_{t_name_words}_name_lower", db.func.lower(BaseWord.name).label("name_lower"),
+    postgresql_ops={"name_lower": "text_pattern_ops"})
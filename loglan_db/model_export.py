@@ -4,9 +4,23 @@ This module contains an "Export extensions" for LOD dictionary SQL model.
 Add export() function to db object for returning its text string presentation.
 """
 
-from datetime import datetime
-from typing import Dict
-from sqlalchemy.orm import Query
+from __future__ import annotations
+
+import os
+import re
+import time
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from sqlalchemy import func, select
+from sqlalchemy.sql import Select
+from sqlalchemy.orm import Query, joinedload
+from loglan_db import db, log, CLIConfig, init_worker_context
+from loglan_db.model_db.base_connect_tables import t_connect_authors, t_connect_words
 from loglan_db.model_db.base_word import BaseWord
 from loglan_db.model_db.base_word_spell import BaseWordSpell
 from loglan_db.model_db.base_definition import BaseDefinition
@@ -17,7 +31,69 @@ from loglan_db.model_db.base_event import BaseEvent
 from loglan_db.model_db.base_author import BaseAuthor
 
 
-class ExportAuthor(BaseAuthor):
+class AddonExportStreamer:
+    """
+    Addon for Export classes with streaming of export() strings
+    """
+    query: Query
+    id: db.Column
+
+    export_sharded: bool = False
+    """Should the table be split into id-range shards for parallel export"""
+
+    @classmethod
+    def export_query(cls, id_range: Tuple[int, int] = None) -> Query:
+        """
+        Query of all records in the order they should be exported
+        Args:
+            id_range: Only records with start <= id < end (Default value = None)
+        Returns:
+            Query
+        """
+        request = cls.query.order_by(cls.id)
+        if id_range:
+            start, end = id_range
+            request = request.filter(cls.id >= start, cls.id < end)
+        return request
+
+    @classmethod
+    def export_stream(
+            cls, batch_size: int = 1000,
+            id_range: Tuple[int, int] = None) -> Iterator[str]:
+        """
+        Yield export() strings of all records one by one.
+        Records are fetched in batches from a server-side cursor,
+        so memory usage does not depend on the size of the table.
+        Args:
+            batch_size: Number of records fetched at once (Default value = 1000)
+            id_range: Only records with start <= id < end (Default value = None)
+        Returns:
+            Iterator of formatted basic strings
+        """
+        for item in cls.export_query(id_range).yield_per(batch_size):
+            yield item.export()
+
+    @classmethod
+    def export_shards(cls, shards: int) -> List[Optional[Tuple[int, int]]]:
+        """
+        Split the table into id ranges of the same size
+        Args:
+            shards: Maximum number of ranges
+        Returns:
+            List of (start, end) ranges or [None, ] if the table is not sharded
+        """
+        if not cls.export_sharded or shards < 2:
+            return [None, ]
+
+        min_id, max_id = db.session.query(func.min(cls.id), func.max(cls.id)).one()
+        if min_id is None:
+            return [None, ]
+
+        step = -(-(max_id - min_id + 1) // shards)
+        return [(start, start + step) for start in range(min_id, max_id + 1, step)]
+
+
+class ExportAuthor(BaseAuthor, AddonExportStreamer):
     """
     ExportAuthor Class
     """
@@ -29,8 +105,23 @@ class ExportAuthor(BaseAuthor):
         """
         return f"{self.abbreviation}@{self.full_name}@{self.notes}"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Optional[str]]:
+        """
+        Convert Author data from text file
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of column values
+        """
+        abbreviation, full_name, notes = line.split("@")
+        return {
+            "abbreviation": abbreviation,
+            "full_name": cls.nullable(full_name),
+            "notes": cls.nullable(notes), }
+
 
-class ExportEvent(BaseEvent):
+class ExportEvent(BaseEvent, AddonExportStreamer):
     """
     ExportEvent Class
     """
@@ -44,8 +135,24 @@ class ExportEvent(BaseEvent):
                f"@{self.date.strftime('%m/%d/%Y')}@{self.definition}" \
                f"@{self.annotation}@{self.suffix}"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Union[int, str, date]]:
+        """
+        Convert Event data from text file
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of column values
+        """
+        event_id, name, event_date, rest = line.split("@", 3)
+        definition, annotation, suffix = rest.rsplit("@", 2)
+        return {
+            "id": int(event_id), "name": name,
+            "date": datetime.strptime(event_date, '%m/%d/%Y').date(),
+            "definition": definition, "annotation": annotation, "suffix": suffix, }
+
 
-class ExportSyllable(BaseSyllable):
+class ExportSyllable(BaseSyllable, AddonExportStreamer):
     """
     ExportSyllable Class
     """
@@ -57,8 +164,22 @@ class ExportSyllable(BaseSyllable):
         """
         return f"{self.name}@{self.type}@{self.allowed}"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Union[str, bool, None]]:
+        """
+        Convert Syllable data from text file
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of column values
+        """
+        name, syllable_type, allowed = line.split("@")
+        return {
+            "name": name, "type": syllable_type,
+            "allowed": {"True": True, "False": False}.get(allowed), }
+
 
-class ExportSetting(BaseSetting):
+class ExportSetting(BaseSetting, AddonExportStreamer):
     """
     ExportSetting Class
     """
@@ -73,8 +194,23 @@ class ExportSetting(BaseSetting):
                f"@{self.last_word_id}" \
                f"@{self.db_release}"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Union[int, str, datetime]]:
+        """
+        Convert Setting data from text file
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of column values
+        """
+        setting_date, db_version, last_word_id, db_release = line.split("@")
+        return {
+            "date": datetime.strptime(setting_date, '%d.%m.%Y %H:%M:%S'),
+            "db_version": int(db_version), "last_word_id": int(last_word_id),
+            "db_release": db_release, }
+
 
-class ExportType(BaseType):
+class ExportType(BaseType, AddonExportStreamer):
     """
     ExportType Class
     """
@@ -87,6 +223,21 @@ class ExportType(BaseType):
         return f"{self.type}@{self.type_x}@{self.group}@{self.parentable}" \
                f"@{self.description if self.description else ''}"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Union[str, bool, None]]:
+        """
+        Convert Type data from text file
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of column values
+        """
+        word_type, type_x, group, parentable, description = line.split("@", 4)
+        return {
+            "type": word_type, "type_x": type_x, "group": cls.nullable(group),
+            "parentable": parentable == "True",
+            "description": description if description else None, }
+
 
 class AddonExportWordConverter:
     """
@@ -104,9 +255,19 @@ class AddonExportWordConverter:
         """
         Returns:
         """
-        source = '/'.join(sorted([author.abbreviation for author in self.authors.all()]))
-        notes: Dict[str, str] = self.notes if self.notes else {}
+        return self._format_source(
+            [author.abbreviation for author in self.authors.all()], self.notes)
 
+    @staticmethod
+    def _format_source(abbreviations: Iterable[str], notes: Optional[Dict[str, str]]) -> str:
+        """
+        Args:
+            abbreviations: Abbreviations of the word's authors
+            notes: Word's notes
+        Returns:
+        """
+        source = '/'.join(sorted(abbreviations))
+        notes = notes if notes else {}
         return f"{source} {notes.get('author', str())}".strip()
 
     @property
@@ -122,14 +283,32 @@ class AddonExportWordConverter:
         """
         Returns:
         """
-        return ' | '.join(cpx.name for cpx in self.complexes)
+        return self._format_usedin(cpx.name for cpx in self.complexes)
+
+    @staticmethod
+    def _format_usedin(names: Iterable[str]) -> str:
+        """
+        Args:
+            names: Names of the word's complexes
+        Returns:
+        """
+        return ' | '.join(names)
 
     @property
     def e_affixes(self) -> str:
         """
         Returns:
         """
-        return ' '.join(afx.name.replace("-", "") for afx in self.affixes).strip()
+        return self._format_affixes(afx.name for afx in self.affixes)
+
+    @staticmethod
+    def _format_affixes(names: Iterable[str]) -> str:
+        """
+        Args:
+            names: Names of the word's affixes
+        Returns:
+        """
+        return ' '.join(name.replace("-", "") for name in names).strip()
 
     @property
     def e_rank(self) -> str:
@@ -139,11 +318,86 @@ class AddonExportWordConverter:
         notes: Dict[str, str] = self.notes if self.notes else {}
         return f"{self.rank} {notes.get('rank', str())}".strip()
 
+    @staticmethod
+    def _bulk_authors(word_ids: Optional[List[int]]) -> Dict[int, List[str]]:
+        """
+        Get authors' abbreviations for all specified words with one query
+        Args:
+            word_ids: Words' ids or None for all words
+        Returns:
+            Dictionary {word_id: [abbreviation, ...]}
+        """
+        return AddonExportWordConverter._group_authors(
+            db.session.execute(AddonExportWordConverter._bulk_authors_select(word_ids)))
 
-class ExportWord(BaseWord, AddonExportWordConverter):
+    @staticmethod
+    def _bulk_authors_select(word_ids: Optional[List[int]]) -> Select:
+        """
+        Statement of `_bulk_authors`, which selects (word_id, abbreviation)
+        """
+        request = select(t_connect_authors.c.WID, BaseAuthor.abbreviation) \
+            .join(BaseAuthor, BaseAuthor.id == t_connect_authors.c.AID)
+
+        if word_ids is not None:
+            request = request.filter(t_connect_authors.c.WID.in_(word_ids))
+        return request
+
+    @staticmethod
+    def _group_authors(rows: Iterable[Tuple[int, str]]) -> Dict[int, List[str]]:
+        authors = defaultdict(list)
+        for word_id, abbreviation in rows:
+            authors[word_id].append(abbreviation)
+        return authors
+
+    @staticmethod
+    def _bulk_derivatives(
+            word_ids: Optional[List[int]], types: Dict[int, BaseType]) -> tuple:
+        """
+        Get names of affixes and complexes for all specified words with one query
+        Ordering is the same as in BaseWord.query_derivatives()
+        Args:
+            word_ids: Words' ids or None for all words
+            types: Dictionary {type_id: BaseType}
+        Returns:
+            Two dictionaries {word_id: [name, ...]} for affixes and complexes
+        """
+        return AddonExportWordConverter._group_derivatives(db.session.execute(
+            AddonExportWordConverter._bulk_derivatives_select(word_ids)), types)
+
+    @staticmethod
+    def _bulk_derivatives_select(word_ids: Optional[List[int]]) -> Select:
+        """
+        Statement of `_bulk_derivatives`, which selects (parent_id, name, type_id)
+        """
+        request = select(
+            t_connect_words.c.parent_id, BaseWord.name, BaseWord.type_id) \
+            .join(BaseWord, BaseWord.id == t_connect_words.c.child_id) \
+            .order_by(BaseWord.name.asc())
+
+        if word_ids is not None:
+            request = request.filter(t_connect_words.c.parent_id.in_(word_ids))
+        return request
+
+    @staticmethod
+    def _group_derivatives(
+            rows: Iterable[Tuple[int, str, int]], types: Dict[int, BaseType]) -> tuple:
+        affixes, complexes = defaultdict(list), defaultdict(list)
+        for parent_id, name, type_id in rows:
+            child_type = types.get(type_id)
+            if child_type is None:
+                continue
+            if child_type.type == "Afx":
+                affixes[parent_id].append(name)
+            if child_type.group == "Cpx":
+                complexes[parent_id].append(name)
+        return affixes, complexes
+
+
+class ExportWord(BaseWord, AddonExportWordConverter, AddonExportStreamer):
     """
     ExportWord Class
     """
+    export_sharded = True
 
     def export(self) -> str:
         """
@@ -151,21 +405,142 @@ class ExportWord(BaseWord, AddonExportWordConverter):
         Returns:
             Formatted basic string
         """
+        return self._export_line(self.type, self.e_affixes, self.e_source, self.e_usedin)
+
+    def _export_line(
+            self, word_type: BaseType, e_affixes: str,
+            e_source: str, e_usedin: str) -> str:
+        """
+        Combine Word data with already converted related values
+        Args:
+            word_type: Word's type
+            e_affixes: Converted affixes
+            e_source: Converted authors
+            e_usedin: Converted complexes
+        Returns:
+            Formatted basic string
+        """
 
         match = self.stringer(self.match)
         tid_old = self.stringer(self.TID_old)
         origin_x = self.stringer(self.origin_x)
         origin = self.stringer(self.origin)
 
-        return f"{self.id_old}@{self.type.type}@{self.type.type_x}@{self.e_affixes}" \
-               f"@{match}@{self.e_source}@{self.e_year}@{self.e_rank}" \
-               f"@{origin}@{origin_x}@{self.e_usedin}@{tid_old}"
+        return f"{self.id_old}@{word_type.type}@{word_type.type_x}@{e_affixes}" \
+               f"@{match}@{e_source}@{self.e_year}@{self.e_rank}" \
+               f"@{origin}@{origin_x}@{e_usedin}@{tid_old}"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Any]:
+        """
+        Convert Word data from text file.
+        Besides column values the result contains names of type, affixes,
+        authors and complexes, which should be resolved to ids by importer.
+        Name and events of the word are stored in the ExportWordSpell's file.
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of values
+        """
+        id_old, word_type, type_x, affixes, match, source, \
+            year, rank, origin, origin_x, used_in, tid_old = line.split("@")
+
+        abbreviations, author_notes = cls._split_note(source)
+        year, year_notes = cls._split_note(year)
+        rank, rank_notes = cls._split_note(rank)
+        notes = {key: value for key, value in (
+            ("author", author_notes), ("year", year_notes), ("rank", rank_notes)) if value}
+
+        return {
+            "id_old": int(id_old), "type": word_type, "type_x": type_x,
+            "affixes": affixes.split(), "match": match,
+            "authors": abbreviations.split("/") if abbreviations else [],
+            "year": date(int(year), 1, 1), "rank": rank, "notes": notes if notes else None,
+            "origin": origin, "origin_x": origin_x,
+            "used_in": used_in.split(" | ") if used_in else [],
+            "TID_old": int(tid_old) if tid_old else None, }
+
+    @staticmethod
+    def _split_note(value: str) -> Tuple[str, str]:
+        """
+        Separate value from its note, e.g. '1988 (?)' > ('1988', '(?)')
+        Args:
+            value: Converted value with optional note
+        Returns:
+            Value and note
+        """
+        value, _, note = value.partition(" ")
+        return value, note
 
-class ExportDefinition(BaseDefinition):
+    @classmethod
+    def export_stream(
+            cls, batch_size: int = 1000,
+            id_range: Tuple[int, int] = None) -> Iterator[str]:
+        """
+        Yield export() strings of all words one by one.
+        Every fetched batch of words is converted with export_bulk()
+        Args:
+            batch_size: Number of words fetched at once (Default value = 1000)
+            id_range: Only words with start <= id < end (Default value = None)
+        Returns:
+            Iterator of formatted basic strings
+        """
+        words = iter(cls.export_query(id_range).yield_per(batch_size))
+        while True:
+            batch = list(islice(words, batch_size))
+            if not batch:
+                return
+            yield from cls.export_bulk(batch)
+
+    @classmethod
+    def export_bulk(cls, words: Optional[List[ExportWord]] = None) -> List[str]:
+        """
+        Prepare data of many words for exporting to text file at once.
+        Types, authors and derivatives are loaded with a few set-based
+        queries instead of separate queries for each word.
+        The result is the same as calling export() for every word.
+
+        Args:
+            words: Words to export (Default value = None)
+            All words ordered by id will be exported if nothing is specified
+        Returns:
+            List of formatted basic strings
+        """
+        word_ids = [word.id for word in words] if words is not None else None
+        words = words if words is not None else cls.query.order_by(cls.id).all()
+
+        if not words:
+            return []
+
+        types = {word_type.id: word_type for word_type in BaseType.query.all()}
+        authors = cls._bulk_authors(word_ids)
+        affixes, complexes = cls._bulk_derivatives(word_ids, types)
+
+        return [word._export_line(
+            word_type=types[word.type_id],
+            e_affixes=cls._format_affixes(affixes[word.id]),
+            e_source=cls._format_source(authors[word.id], word.notes),
+            e_usedin=cls._format_usedin(complexes[word.id]),
+        ) for word in words]
+
+
+class ExportDefinition(BaseDefinition, AddonExportStreamer):
     """
     ExportDefinition Class
     """
+    export_sharded = True
+
+    @classmethod
+    def export_query(cls, id_range: Tuple[int, int] = None) -> Query:
+        """
+        Query of all definitions with their source words
+        Args:
+            id_range: Only definitions with start <= id < end (Default value = None)
+        Returns:
+            Query
+        """
+        return super().export_query(id_range).options(joinedload(cls._source_word))
+
     @property
     def e_grammar(self) -> str:
         """
@@ -183,13 +558,44 @@ class ExportDefinition(BaseDefinition):
             Formatted basic string
         """
         return f"{self.source_word.id_old}@{self.position}@{self.usage if self.usage else ''}" \
-               f"@{self.e_grammar}@{self.body}@@{self.case_tags if self.case_tags else ''}"
+               f"@{self.e_grammar}@{self.body}@{self.notes if self.notes else ''}" \
+               f"@{self.case_tags if self.case_tags else ''}"
+
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Union[int, str, None]]:
+        """
+        Convert Definition data from text file.
+        The source word is specified by its id_old and should be resolved by importer.
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of values
+        """
+        word_id_old, position, usage, grammar, rest = line.split("@", 4)
+        body, notes, case_tags = rest.rsplit("@", 2)
+        slots, grammar_code = re.match(r"(\d*)(.*)", grammar).groups()
+        return {
+            "word_id_old": int(word_id_old), "position": int(position),
+            "usage": usage or None, "slots": int(slots) if slots else None,
+            "grammar_code": grammar_code or None, "body": body,
+            "notes": notes or None, "case_tags": case_tags or None, }
 
 
-class ExportWordSpell(BaseWordSpell, BaseWord):
+class ExportWordSpell(BaseWordSpell, BaseWord, AddonExportStreamer):
     """
     ExportWordSpell Class
     """
+    @classmethod
+    def export_query(cls, id_range: Tuple[int, int] = None) -> Query:
+        """
+        Query of all words with their end events
+        Args:
+            id_range: Only words with start <= id < end (Default value = None)
+        Returns:
+            Query
+        """
+        return super().export_query(id_range).options(joinedload(cls._event_end))
+
     def export(self) -> str:
         """
         Prepare WordSpell data for exporting to text file
@@ -201,7 +607,166 @@ class ExportWordSpell(BaseWordSpell, BaseWord):
         return f"{self.id_old}@{self.name}@{self.name.lower()}@{code_name}" \
                f"@{self.event_start_id}@{self.event_end_id if self.event_end else 9999}@"
 
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Union[int, str, None]]:
+        """
+        Convert WordSpell data from text file
+        Args:
+            line: Formatted basic string
+        Returns:
+            Dictionary of values
+        """
+        id_old, name, _, _, event_start_id, event_end_id, _ = line.split("@")
+        return {
+            "id_old": int(id_old), "name": name,
+            "event_start_id": int(event_start_id),
+            "event_end_id": None if int(event_end_id) == 9999 else int(event_end_id), }
+
 
 export_models_pg = (
     ExportAuthor, ExportDefinition, ExportEvent, ExportSetting,
     ExportSyllable, ExportType, ExportWord, ExportWordSpell, )
+
+
+@dataclass
+class ExportStat:
+    """Statistics of exporting one table to text file"""
+    table: str
+    rows: int
+    seconds: float
+    """*Wall-clock time from the start of the first part to the end of the last one*"""
+    worker_seconds: float = 0.0
+    """*Total time spent by workers, equal to seconds for the serial export*"""
+    started: float = 0.0
+    """*Unix time of the start*"""
+
+    @property
+    def rate(self) -> float:
+        """
+        Returns:
+            Rows written per second of wall-clock time
+        """
+        return self.rows / self.seconds if self.seconds else float(self.rows)
+
+
+def export_to_file(
+        model, path: str, batch_size: int = 1000,
+        id_range: Tuple[int, int] = None) -> ExportStat:
+    """
+    Stream export() strings of all model's records to text file
+    Args:
+        model: One of export_models_pg classes
+        path: Path to the output file
+        batch_size: Number of records fetched at once (Default value = 1000)
+        id_range: Only records with start <= id < end (Default value = None)
+    Returns:
+        ExportStat
+    """
+    rows = 0
+    started, started_at = time.perf_counter(), time.time()
+
+    with open(path, "w", encoding="utf-8") as file:
+        for line in model.export_stream(batch_size=batch_size, id_range=id_range):
+            file.write(f"{line}\n")
+            rows += 1
+
+    seconds = time.perf_counter() - started
+    stat = ExportStat(model.__tablename__, rows, seconds, seconds, started_at)
+    log.info("%s: %d rows written in %.2f s (%.0f rows/s)",
+             stat.table, stat.rows, stat.seconds, stat.rate)
+    return stat
+
+
+def export_to_files(
+        directory: str, models: Tuple = export_models_pg,
+        batch_size: int = 1000) -> Dict[str, ExportStat]:
+    """
+    Export every model to its own text file named after the model's table
+    Args:
+        directory: Directory for output files
+        models: Export classes (Default value = export_models_pg)
+        batch_size: Number of records fetched at once (Default value = 1000)
+    Returns:
+        Dictionary {table name: ExportStat}
+    """
+    os.makedirs(directory, exist_ok=True)
+    return {model.__tablename__: export_to_file(
+        model, os.path.join(directory, f"{model.__tablename__}.txt"), batch_size)
+        for model in models}
+
+
+def export_to_files_parallel(
+        directory: str, config=CLIConfig, models: Tuple = export_models_pg,
+        shards: int = 4, processes: int = None,
+        batch_size: int = 1000) -> Dict[str, ExportStat]:
+    """
+    Export every model to its own text file using a pool of processes.
+    Each worker has its own app, engine and connection.
+    Sharded models (words and definitions) are exported in id ranges
+    by different workers, then parts are concatenated in order.
+    Args:
+        directory: Directory for output files
+        config: Database Config for workers, it should be picklable
+            (Default value = CLIConfig)
+        models: Export classes (Default value = export_models_pg)
+        shards: Maximum number of id ranges for sharded models (Default value = 4)
+        processes: Number of worker processes (Default value = os.cpu_count())
+        batch_size: Number of records fetched at once (Default value = 1000)
+    Returns:
+        Dictionary {table name: ExportStat}
+    """
+    os.makedirs(directory, exist_ok=True)
+    tasks = {}
+    for model in models:
+        path = os.path.join(directory, f"{model.__tablename__}.txt")
+        id_ranges = model.export_shards(shards)
+        tasks[model] = [(
+            path if len(id_ranges) == 1 else f"{path}.part{number}", id_range)
+            for number, id_range in enumerate(id_ranges)]
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+            max_workers=processes, initializer=init_worker_context,
+            initargs=(config, )) as executor:
+        futures = {model: [
+            executor.submit(export_to_file, model, part_path, batch_size, id_range)
+            for part_path, id_range in parts] for model, parts in tasks.items()}
+        part_stats = {model: [future.result() for future in model_futures]
+                      for model, model_futures in futures.items()}
+
+    result = {}
+    for model, parts in tasks.items():
+        if len(parts) > 1:
+            _concatenate_parts(
+                [part_path for part_path, _ in parts],
+                os.path.join(directory, f"{model.__tablename__}.txt"))
+
+        stats = part_stats[model]
+        started_at = min(stat.started for stat in stats)
+        result[model.__tablename__] = ExportStat(
+            model.__tablename__, sum(stat.rows for stat in stats),
+            max(stat.started + stat.seconds for stat in stats) - started_at,
+            sum(stat.worker_seconds for stat in stats), started_at)
+
+    seconds = time.perf_counter() - started
+    rows = sum(stat.rows for stat in result.values())
+    log.info("All tables: %d rows written in %.2f s (%.0f rows/s, %.2f s of workers)",
+             rows, seconds, rows / seconds if seconds else float(rows),
+             sum(stat.worker_seconds for stat in result.values()))
+    return result
+
+
+def _concatenate_parts(part_paths: List[str], path: str) -> None:
+    """
+    Join exported parts into one file in the specified order and remove them
+    Args:
+        part_paths: Paths of parts
+        path: Path to the output file
+    Returns:
+        None
+    """
+    with open(path, "wb") as file:
+        for part_path in part_paths:
+            with open(part_path, "rb") as part:
+                shutil.copyfileobj(part, file)
+            os.remove(part_path)
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains a cache of rendered HTML results
+for `HTMLExportWord.html_all_by_name` and `HTMLExportWord.translation_by_key`.
+
+The cache is disabled by default. Enable it with a chosen backend:
+
+<details><summary>Show Examples</summary><p>
+```python
+set_result_cache(HTMLResultCache(MemoryBackend(maxsize=4096)))
+# or shared between worker processes
+set_result_cache(HTMLResultCache(SQLiteBackend("/tmp/lod_html_cache.sqlite")))
+```
+</p></details>
+"""
+from __future__ import annotations
+
+import inspect
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+from loglan_db import db, log
+from loglan_db.model_db.base_event import BaseEvent
+from loglan_db.model_db.base_setting import BaseSetting
+
+MISSING = object()
+"""Sentinel returned by backends for keys, which are not cached"""
+
+
+class MemoryBackend:
+    """In-process LRU storage bounded by the number of items"""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._items: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Any:
+        """
+        Get cached value or MISSING
+        """
+        with self._lock:
+            if key not in self._items:
+                return MISSING
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def set(self, key: str, value: Optional[str]) -> None:
+        """
+        Store the value and evict the least recently used items
+        """
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove all items
+        """
+        with self._lock:
+            self._items.clear()
+
+
+class SQLiteBackend:
+    """On-disk LRU storage, which can be shared by several worker processes
+
+    Each process should create its own instance (e.g. in a worker initializer),
+    as a sqlite3 connection cannot be used after fork.
+    """
+
+    def __init__(self, path: str, maxsize: int = 10000, timeout: float = 5.0):
+        self.path = path
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS html_cache "
+            "(key TEXT PRIMARY KEY, value TEXT, used INTEGER NOT NULL)")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM html_cache").fetchone()[0]
+
+    def get(self, key: str) -> Any:
+        """
+        Get cached value or MISSING
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM html_cache WHERE key = ?", (key, )).fetchone()
+            if row is None:
+                return MISSING
+            self._connection.execute(
+                "UPDATE html_cache SET used = ? WHERE key = ?", (time.time_ns(), key))
+            return row[0]
+
+    def set(self, key: str, value: Optional[str]) -> None:
+        """
+        Store the value and evict the least recently used items
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO html_cache (key, value, used) VALUES (?, ?, ?)",
+                (key, value, time.time_ns()))
+            self._connection.execute(
+                "DELETE FROM html_cache WHERE key IN (SELECT key FROM html_cache "
+                "ORDER BY used DESC, rowid DESC LIMIT -1 OFFSET ?)", (self.maxsize, ))
+
+    def clear(self) -> None:
+        """
+        Remove all items
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM html_cache")
+
+
+class HTMLResultCache:
+    """Cache of rendered HTML results
+
+    Keys include the dictionary's version (`BaseSetting.db_version`
+    and `BaseSetting.last_word_id`), which is checked no more often
+    than once per `check_interval` seconds. When the version changes,
+    the backend is cleared.
+    """
+
+    def __init__(self, backend=None, check_interval: float = 60):
+        self.backend = backend if backend is not None else MemoryBackend()
+        """*Storage with get(), set() and clear() methods*"""
+        self.check_interval = check_interval
+        """*Minimal interval between version checks in seconds*"""
+        self.hits = 0
+        """*Number of results served from the cache*"""
+        self.misses = 0
+        """*Number of rendered results*"""
+        self._version: Optional[Tuple[Optional[int], Optional[int]]] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_version() -> Tuple[Optional[int], Optional[int]]:
+        row = db.session.query(BaseSetting.db_version, BaseSetting.last_word_id) \
+            .order_by(BaseSetting.id.desc()).first()
+        return tuple(row) if row else (None, None)
+
+    @property
+    def version(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Current (db_version, last_word_id), the backend is cleared if they have changed
+        """
+        if self._version is not None and time.monotonic() - self._checked_at < self.check_interval:
+            return self._version
+
+        version = self._load_version()
+        with self._lock:
+            if self._version is not None and version != self._version:
+                log.info("HTML cache cleared: version %s -> %s", self._version, version)
+                self.backend.clear()
+            self._version, self._checked_at = version, time.monotonic()
+        return version
+
+    def key(self, *parts) -> str:
+        """
+        Build the key from its parts and the current version
+        """
+        return json.dumps([*parts, *self.version], default=str, ensure_ascii=False)
+
+    def get_or_render(self, key: str, render: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Get cached result or render and store it
+        """
+        value = self.backend.get(key)
+        if value is not MISSING:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = render()
+        self.backend.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        """
+        Remove all results and reset statistics
+        """
+        self.backend.clear()
+        self.hits = self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        Part of results served from the cache
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self) -> dict:
+        """
+        Get the cache statistics
+        """
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "size": len(self.backend), "version": self._version, }
+
+
+_result_cache: Optional[HTMLResultCache] = None
+
+
+def set_result_cache(cache: Optional[HTMLResultCache]) -> None:
+    """
+    Enable the result cache or disable it with None
+    """
+    global _result_cache  # pylint: disable=W0603
+    _result_cache = cache
+
+
+def get_result_cache() -> Optional[HTMLResultCache]:
+    """
+    Get the active result cache or None if it is disabled
+    """
+    return _result_cache
+
+
+def cached_html(*ignored: str):
+    """
+    Decorator for functions rendering HTML, which caches their results
+    in the active result cache (see `set_result_cache`).
+    The key contains the function's name and all its arguments,
+    except 'cls' and ignored ones. 'event_id' is resolved to the actual id.
+    Args:
+        *ignored: Names of arguments, which do not affect the result
+    """
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+        names = [name for name in signature.parameters if name not in ("cls", *ignored)]
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            cache = _result_cache
+            if cache is None:
+                return function(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            values = dict(arguments.arguments)
+            if "event_id" in values:
+                values["event_id"] = _resolve_event_id(values["event_id"])
+
+            key = cache.key(function.__qualname__, *(values[name] for name in names))
+            return cache.get_or_render(key, lambda: function(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+def _resolve_event_id(event_id) -> Optional[int]:
+    if not event_id:
+        return BaseEvent.latest_id()
+    return event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
@@ -3,13 +3,38 @@
 This module contains a HTMLExportDefinition Model
 """
 import re
+from functools import lru_cache
 
 from loglan_db import db
 from loglan_db.model_db.base_definition import BaseDefinition
 from loglan_db.model_html import DEFAULT_HTML_STYLE
+from loglan_db.model_html.html_style import get_style
 from loglan_db.model_html.html_word import HTMLExportWord
 
 
+KEY_CONTENT = r"(?:(?!</?k>)[^@])*"
+"""Regex of any key's content, which cannot contain key tags and '@'"""
+
+
+@lru_cache(maxsize=1024)
+def key_regex(word: str, case_sensitive: bool = False) -> re.Pattern:
+    """
+    Compiled regex of any key tag, which captures the content of the specified key
+    '*' in the word matches any sequence of characters within the key,
+    other characters are matched literally
+    :param word:
+    :param case_sensitive:
+    :return:
+    """
+    return re.compile(
+        f"<(?:k>(?:({KEY_CONTENT.join(re.escape(part) for part in word.split('*'))})</k>)?|/k>)",
+        flags=0 if case_sensitive else re.IGNORECASE)
+
+
+def _keep_key(match: re.Match) -> str:
+    return str() if match[1] is None else f"<k>{match[1]}</k>"
+
+
 class DefinitionFormatter:
     """
     Additional methods for definition's formatting
@@ -37,32 +62,13 @@ class DefinitionFormatter:
     def highlight_key(def_body, word, case_sensitive: bool = False) -> str:
         """
         Highlights the current key from the list, deselecting the rest
+        The body is scanned once with the compiled regex cached for each key
         :param def_body:
         :param word:
         :param case_sensitive:
         :return:
         """
-
-        to_key = '<k>'  # key
-        tc_key = '</k>'
-        to_del = '<do_not_delete>'
-        tc_del = '</do_not_delete>'
-
-        key_pattern = f"{to_key}{word.replace('*', '.*')}{tc_key}"
-        list_of_keys = def_body.replace("</k>", "</k>@").split("@")
-
-        for key in list_of_keys:
-            res = re.search(key_pattern, key, flags=0 if case_sensitive else re.IGNORECASE)
-            if not res:
-                continue
-            original_key = res[0]
-            replace_key = original_key.replace(to_key, to_del).replace(tc_key, tc_del)
-            def_body = def_body.replace(original_key, replace_key)
-
-        def_body = def_body.replace(tc_key, str()).replace(to_key, str())
-        def_body = def_body.replace(to_del, to_key).replace(tc_del, tc_key)
-
-        return def_body
+        return key_regex(word, case_sensitive).sub(_keep_key, def_body)
 
     @staticmethod
     def tagged_word_origin_x(d_source_word, tag: str) -> str:
@@ -129,34 +135,19 @@ class HTMLExportDefinition(BaseDefinition, DefinitionFormatter):
         :return:
         """
 
-        # de = definition english
-        tags = {
-            "normal": [
-                '<span class="dg">(%s)</span>',
-                '<span class="dt">[%s]</span> ',
-                ' <span class="db">%s</span>',
-                f'<span class="definition eng" id={self.id}>%s</span>',
-                '<div class="d_line">%s</div>',
-                '<span class="w_name">%s</span>, ',
-                '<span class="w_origin">&lt;%s&gt;</span> ',
-            ],
-            "ultra": [
-                '(%s)', '[%s] ', ' %s', '<de>%s</de>',
-                '<ld>%s</ld>', '<wn>%s</wn>, ', '<o>&lt;%s&gt;</o> ', ],
-        }
-
-        t_d_gram, t_d_tags, t_d_body, t_def, t_def_line, t_word_name, t_word_origin = tags[style]
+        tags = get_style(style).english
 
         gram_form = self.stringer(self.slots) + self.grammar_code
-        def_gram = t_d_gram % gram_form if gram_form else ''
-        def_tags = t_d_tags % self.case_tags.replace("-", "&zwj;-&zwj;") if self.case_tags else ''
+        def_gram = tags.grammar % gram_form if gram_form else ''
+        def_tags = tags.case_tags % self.case_tags.replace("-", "&zwj;-&zwj;") \
+            if self.case_tags else ''
 
-        def_body = self.tagged_definition_body(self.body, word, t_d_body)
-        word_name = self.tagged_word_name(self.usage, self.source_word, t_word_name)
-        word_origin_x = self.tagged_word_origin_x(self.source_word, t_word_origin)
+        def_body = self.tagged_definition_body(self.body, word, tags.body)
+        word_name = self.tagged_word_name(self.usage, self.source_word, tags.word_name)
+        word_origin_x = self.tagged_word_origin_x(self.source_word, tags.word_origin)
 
-        definition = t_def % f'{def_tags}{def_gram}{def_body}'
-        return t_def_line % f'{word_name}{word_origin_x}{definition}'
+        definition = tags.definition % {"id": self.id, "content": f'{def_tags}{def_gram}{def_body}'}
+        return tags.line % f'{word_name}{word_origin_x}{definition}'
 
     def export_for_loglan(self, style: str = DEFAULT_HTML_STYLE) -> str:
         """
@@ -164,19 +155,13 @@ class HTMLExportDefinition(BaseDefinition, DefinitionFormatter):
         :param style:
         :return:
         """
-        tags = {
-            # usage, gram, body, tags, definition
-            "normal": [
-                '<span class="du">%s</span> ', '<span class="dg">(%s)</span> ',
-                '<span class="db">%s</span>', ' <span class="dt">[%s]</span>',
-                f'<div class="definition log" id={self.id}>%s</div>', ],
-            "ultra": ['<du>%s</du> ', '(%s) ', '%s', ' [%s]', '<dl>%s</dl>', ],
-        }
-        t_d_usage, t_d_gram, t_d_body, t_d_tags, t_definition = tags[style]
-
-        def_usage = t_d_usage % self.usage.replace("%", "—") if self.usage else ''
+        tags = get_style(style).loglan
+
+        def_usage = tags.usage % self.usage.replace("%", "—") if self.usage else ''
         gram_form = f"{str(self.slots) if self.slots else ''}" + self.grammar_code
-        def_gram = t_d_gram % gram_form if gram_form else ''
-        def_body = t_d_body % self.format_body(self.body)
-        def_tags = t_d_tags % self.case_tags.replace("-", "&zwj;-&zwj;") if self.case_tags else ''
-        return t_definition % f'{def_usage}{def_gram}{def_body}{def_tags}'
+        def_gram = tags.grammar % gram_form if gram_form else ''
+        def_body = tags.body % self.format_body(self.body)
+        def_tags = tags.case_tags % self.case_tags.replace("-", "&zwj;-&zwj;") \
+            if self.case_tags else ''
+        content = f'{def_usage}{def_gram}{def_body}{def_tags}'
+        return tags.definition % {"id": self.id, "content": content}
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains generators of the whole static HTML dictionary.
+
+Loglan side: words of the event are rendered into one HTML file per initial letter,
+each file contains what `HTMLExportWord.html_all_by_name`
+returns for the letter's pattern (e.g. 'a*'). Words are selected
+by their first character, so letters like '_' or '%' are not LIKE wildcards.
+
+Letters are rendered by a pool of processes, every worker
+has its own app, engine and connection (see `loglan_db.init_worker_context`)
+and loads related data of its letter's words in bulk (see `HTMLExportWord.prefetch`).
+
+<details><summary>Show Examples</summary><p>
+```python
+export_dictionary_html("/tmp/lod_html", style="normal", event_id=6)
+# {'a': '/tmp/lod_html/a_RDC.html', 'b': '/tmp/lod_html/b_RDC.html', ...}
+```
+</p></details>
+
+English side: the reverse index of keys is built with one ordered scan
+of keys, connect_keys, definitions and words, and every key's block
+contains what `HTMLExportWord.translation_by_key` returns for the key.
+
+<details><summary>Show Examples</summary><p>
+```python
+export_keys_html("/tmp/lod_html", language="en", style="normal", event_id=6)
+# {'en_a': '/tmp/lod_html/en_a_RDC.html', 'en_b': '/tmp/lod_html/en_b_RDC.html', ...}
+```
+</p></details>
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from html import escape
+from itertools import groupby
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from sqlalchemy.orm import contains_eager
+
+from loglan_db import db, log, CLIConfig, init_worker_context
+from loglan_db.model_db.base_connect_tables import t_connect_keys
+from loglan_db.model_db.base_event import BaseEvent
+from loglan_db.model_db.base_key import BaseKey
+from loglan_db.model_html import DEFAULT_HTML_STYLE
+from loglan_db.model_html.html_style import get_style
+from loglan_db.model_html.html_word import HTMLExportWord
+
+
+def _resolve_event_id(event_id: Union[BaseEvent, int, None]) -> int:
+    if not event_id:
+        event_id = BaseEvent.latest_id()
+    return event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
+
+
+def _initial():
+    return db.func.lower(db.func.substr(HTMLExportWord.name, 1, 1))
+
+
+def dictionary_letters(event_id: int) -> List[str]:
+    """
+    Get initial letters of all words of the event
+    Args:
+        event_id: Event's id
+    Returns:
+        Sorted list of lowercase letters
+    """
+    request = HTMLExportWord._filter_event(event_id, db.session.query(_initial()).distinct())
+    return sorted(letter for (letter, ) in request if letter)
+
+
+def export_letter_html(letter: str, path: str, style: str, event_id: int) -> int:
+    """
+    Render all words starting with the letter into the HTML file
+    Args:
+        letter: Initial letter of words
+        path: Path to the output file
+        style: HTML design style
+        event_id: Event's id
+    Returns:
+        Number of written characters
+    """
+    words = HTMLExportWord.by_event(event_id).filter(_initial() == letter).all()
+    html = HTMLExportWord.html_all(words, style=style) or str()
+    with open(path, "w", encoding="utf-8") as file:
+        return file.write(html)
+
+
+def export_dictionary_html(
+        directory: str, style: str = DEFAULT_HTML_STYLE,
+        event_id: Union[BaseEvent, int] = None, config=CLIConfig,
+        processes: Optional[int] = None) -> Dict[str, str]:
+    """
+    Render the whole dictionary of the event into per-letter HTML files
+    named '{letter}_{event suffix}.html'
+    Args:
+        directory: Directory for output files
+        style: HTML design style (Default value = DEFAULT_HTML_STYLE)
+        event_id: Event object or Event.id (Default value = None, the latest)
+        config: Database Config for workers, it should be picklable
+            (Default value = CLIConfig)
+        processes: Number of worker processes, 1 renders letters
+            in the current process (Default value = os.cpu_count())
+    Returns:
+        Dictionary {letter: path}
+    """
+    event_id = _resolve_event_id(event_id)
+    suffix = BaseEvent.get_by_id(event_id).suffix
+
+    os.makedirs(directory, exist_ok=True)
+    paths = {letter: os.path.join(directory, f"{letter}_{suffix}.html")
+             for letter in dictionary_letters(event_id)}
+
+    if processes == 1:
+        for letter, path in paths.items():
+            export_letter_html(letter, path, style, event_id)
+    else:
+        with ProcessPoolExecutor(
+                max_workers=processes, initializer=init_worker_context,
+                initargs=(config, )) as executor:
+            futures = [executor.submit(export_letter_html, letter, path, style, event_id)
+                       for letter, path in paths.items()]
+            for future in futures:
+                future.result()
+
+    log.info("HTML dictionary (%s, %s): %d letters written to %s",
+             suffix, style, len(paths), directory)
+    return paths
+
+
+def iter_key_translations(
+        language: str = None, style: str = DEFAULT_HTML_STYLE,
+        event_id: Union[BaseEvent, int] = None,
+        batch_size: int = 1000) -> Iterator[Tuple[str, str, str]]:
+    """
+    Yield translations of all keys with one ordered query instead of
+    calling `translation_by_key` for each key. Keys, which differ only
+    in case, are merged the same way as case-insensitive search does.
+    Args:
+        language: Language of keys (Default value = None, all languages)
+        style: HTML design style (Default value = DEFAULT_HTML_STYLE)
+        event_id: Event object or Event.id (Default value = None, the latest)
+        batch_size: Number of rows fetched at once (Default value = 1000)
+    Returns:
+        Iterator of (key, language, HTML), ordered by language and key
+    """
+    event_id = _resolve_event_id(event_id)
+    word = HTMLExportWord
+    definition = word._definitions.property.mapper.class_
+    key_word = db.func.lower(BaseKey.word).label("key_word")
+
+    request = db.session.query(key_word, BaseKey.language, definition) \
+        .join(t_connect_keys, t_connect_keys.c.KID == BaseKey.id) \
+        .join(definition, definition.id == t_connect_keys.c.DID) \
+        .join(definition._source_word) \
+        .options(contains_eager(definition._source_word).joinedload(word._type))
+    if language:
+        request = request.filter(BaseKey.language == language)
+    request = word._filter_event(event_id, request).order_by(
+        BaseKey.language, key_word, word.name, word.id, definition.id)
+
+    rows = request.yield_per(batch_size)
+    for (key, key_language), items in groupby(rows, lambda row: (row[0], row[1])):
+        definitions = {item.id: item for _, _, item in items}
+        yield key, key_language, "\n".join(
+            item.export_for_english(key, style) for item in definitions.values()).strip()
+
+
+def export_keys_html(
+        directory: str, language: str = None, style: str = DEFAULT_HTML_STYLE,
+        event_id: Union[BaseEvent, int] = None,
+        batch_size: int = 1000) -> Dict[str, str]:
+    """
+    Write the reverse index of keys into HTML files sharded by language
+    and the key's initial letter, named '{language}_{letter}_{event suffix}.html'.
+    Keys starting with other characters are written into the '_' shard.
+    Args:
+        directory: Directory for output files
+        language: Language of keys (Default value = None, all languages)
+        style: HTML design style (Default value = DEFAULT_HTML_STYLE)
+        event_id: Event object or Event.id (Default value = None, the latest)
+        batch_size: Number of rows fetched at once (Default value = 1000)
+    Returns:
+        Dictionary {'{language}_{letter}': path}
+    """
+    event_id = _resolve_event_id(event_id)
+    suffix = BaseEvent.get_by_id(event_id).suffix
+    os.makedirs(directory, exist_ok=True)
+
+    templates = get_style(style)
+    paths, keys = {}, 0
+    with ExitStack() as stack:
+        files = {}
+        for key, key_language, translations in iter_key_translations(
+                language, style, event_id, batch_size):
+            letter = key[0] if key[0].isalnum() else "_"
+            shard = f"{key_language}_{letter}"
+            if shard not in files:
+                paths[shard] = os.path.join(directory, f"{shard}_{suffix}.html")
+                files[shard] = stack.enter_context(open(paths[shard], "w", encoding="utf-8"))
+                files[shard].write(templates.keys.split("%s")[0])
+            else:
+                files[shard].write("\n")
+            escaped_key = escape(key, quote=True)
+            files[shard].write(templates.key % (escaped_key, escaped_key, translations))
+            keys += 1
+
+        for file in files.values():
+            file.write(templates.keys.split("%s")[1])
+
+    log.info("HTML key index (%s, %s): %d keys written to %d files in %s",
+             suffix, style, keys, len(paths), directory)
+    return paths
@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains an optional materialized table of words' meanings
+(see `loglan_db.model_html.html_word.Meaning`) for each HTML style.
+
+When the store is enabled, `HTMLExportWord.html_all_by_name` reads
+precomputed meanings with one indexed query instead of loading
+types, authors, derivatives and definitions of every word.
+Meanings of words touched within a session (the words themselves,
+their definitions, authors, types and derivatives) are rebuilt
+after each flush in the same transaction. Words, which links are written
+with Core statements, should be marked with `mark_words_changed`,
+their meanings are rebuilt on the next flush or before commit.
+
+<details><summary>Show Examples</summary><p>
+```python
+HTMLWordMeaning.enable()
+HTMLWordMeaning.rebuild()  # the initial full build
+```
+</p></details>
+"""
+from __future__ import annotations
+
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from loglan_db import db, log
+from loglan_db.model_db import t_name_word_meanings, t_name_words
+from loglan_db.model_db.base_author import BaseAuthor
+from loglan_db.model_db.base_connect_tables import t_connect_authors, t_connect_words, \
+    CHANGED_WORDS_KEY
+from loglan_db.model_db.base_definition import BaseDefinition
+from loglan_db.model_db.base_type import BaseType
+from loglan_db.model_db.base_word import BaseWord
+from loglan_db.model_html.html_definition import HTMLExportDefinition
+from loglan_db.model_html.html_word import HTMLExportWord, Meaning
+from loglan_db.model_init import InitBase, DBBase
+
+__pdoc__ = {
+    'HTMLWordMeaning.created': False, 'HTMLWordMeaning.updated': False,
+}
+
+AFFECTED_KEY = "loglan_db_affected_meanings"
+"""Key of `Session.info` for objects affected by the current flush"""
+
+
+class HTMLWordMeaning(db.Model, InitBase, DBBase):
+    """Precomputed `Meaning` of the word in the HTML style"""
+    __tablename__ = t_name_word_meanings
+
+    word_id = db.Column(
+        db.Integer, db.ForeignKey(f'{t_name_words}.id', ondelete="CASCADE"), primary_key=True)
+    style = db.Column(db.String(16), primary_key=True)
+    technical = db.Column(db.Text, nullable=False)
+    definitions = db.Column(db.JSON, nullable=False)
+    used_in = db.Column(db.Text)
+
+    STYLES = ("normal", "ultra")
+    """*Styles, for which meanings are built*"""
+    enabled = False
+    """*Whether meanings are read and rebuilt*"""
+
+    @classmethod
+    def enable(cls) -> None:
+        """
+        Start using precomputed meanings and rebuilding them on changes
+        """
+        cls.enabled = True
+        HTMLExportWord.meaning_store = cls
+
+    @classmethod
+    def disable(cls) -> None:
+        """
+        Stop using precomputed meanings
+        """
+        cls.enabled = False
+        HTMLExportWord.meaning_store = None
+
+    @classmethod
+    def get_many(cls, word_ids: List[int], style: str) -> Dict[int, Meaning]:
+        """
+        Get precomputed meanings of words with one query
+        Args:
+            word_ids: Words' ids
+            style: HTML design style
+        Returns:
+            Dictionary {word_id: Meaning} for words, which meanings are built
+        """
+        rows = db.session.query(cls.word_id, cls.technical, cls.definitions, cls.used_in) \
+            .filter(cls.style == style, cls.word_id.in_(word_ids))
+        return {row.word_id: Meaning(*row) for row in rows}
+
+    @classmethod
+    def rebuild(cls, word_ids: Optional[Iterable[int]] = None, batch_size: int = 500) -> int:
+        """
+        Build meanings of specified words (all words by default) and commit them
+        Args:
+            word_ids: Words' ids (Default value = None)
+            batch_size: Number of words processed at once (Default value = 500)
+        Returns:
+            Number of processed words
+        """
+        if word_ids is None:
+            db.session.execute(cls.__table__.delete())
+            word_ids = [word_id for (word_id, ) in db.session.query(BaseWord.id)]
+        try:
+            count = cls._rebuild(sorted(set(word_ids)), batch_size)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        log.info("Meanings rebuilt for %d words", count)
+        return count
+
+    @classmethod
+    def _rebuild(cls, word_ids: List[int], batch_size: int = 500) -> int:
+        """
+        Replace meanings of specified words without committing
+        """
+        for start in range(0, len(word_ids), batch_size):
+            ids = word_ids[start:start + batch_size]
+            db.session.execute(cls.__table__.delete().where(cls.word_id.in_(ids)))
+
+            words = HTMLExportWord.query.filter(HTMLExportWord.id.in_(ids)).all()
+            HTMLExportWord.prefetch(words)
+            try:
+                rows = [{
+                    "word_id": word.id, "style": style, "technical": meaning.technical,
+                    "definitions": meaning.definitions, "used_in": meaning.used_in, }
+                    for word in words for style in cls.STYLES
+                    for meaning in [word.meaning(style)]]
+            finally:
+                for word in words:
+                    word._prefetched = None
+            if rows:
+                db.session.execute(cls.__table__.insert(), rows)
+        return len(word_ids)
+
+    @staticmethod
+    def affected_words(
+            word_ids: Set[int], author_ids: Set[int], type_ids: Set[int]) -> Set[int]:
+        """
+        Expand changed words with their parents (their affixes and complexes
+        are a part of parents' meanings) and words of changed authors and types
+        """
+        result = set(word_ids)
+        if word_ids:
+            result.update(parent_id for (parent_id, ) in db.session.query(
+                t_connect_words.c.parent_id).filter(t_connect_words.c.child_id.in_(word_ids)))
+        if author_ids:
+            result.update(word_id for (word_id, ) in db.session.query(
+                t_connect_authors.c.WID).filter(t_connect_authors.c.AID.in_(author_ids)))
+        if type_ids:
+            result.update(word_id for (word_id, ) in db.session.query(
+                BaseWord.id).filter(BaseWord.type_id.in_(type_ids)))
+        return result
+
+
+def _affected_objects(session: Session) -> Dict[str, Set[int]]:
+    return session.info.setdefault(
+        AFFECTED_KEY, {"words": set(), "authors": set(), "types": set()})
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_parents_of_deleted_words(session: Session, *_) -> None:
+    if not HTMLWordMeaning.enabled:
+        return
+    word_ids = {obj.id for obj in session.deleted if isinstance(obj, BaseWord)}
+    if not word_ids:
+        return
+    with session.no_autoflush:
+        _affected_objects(session)["words"].update(
+            parent_id for (parent_id, ) in session.query(t_connect_words.c.parent_id)
+            .filter(t_connect_words.c.child_id.in_(word_ids)))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_affected_objects(session: Session, _) -> None:
+    if not HTMLWordMeaning.enabled:
+        return
+    affected = _affected_objects(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, BaseWord):
+            affected["words"].add(obj.id)
+        elif isinstance(obj, BaseDefinition):
+            affected["words"].add(obj.word_id)
+            affected["words"].update(inspect(obj).attrs.word_id.history.deleted)
+        elif isinstance(obj, BaseAuthor):
+            affected["authors"].add(obj.id)
+        elif isinstance(obj, BaseType):
+            affected["types"].add(obj.id)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def _rebuild_affected_meanings(session: Session, _) -> None:
+    affected = session.info.pop(AFFECTED_KEY, None)
+    changed = session.info.pop(CHANGED_WORDS_KEY, set())
+    if not HTMLWordMeaning.enabled or not (affected or changed):
+        return
+
+    affected = affected or {"words": set(), "authors": set(), "types": set()}
+    _rebuild_words(session, HTMLWordMeaning.affected_words(
+        affected["words"] | changed, affected["authors"], affected["types"]))
+
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_changed_words(session: Session) -> None:
+    changed = session.info.pop(CHANGED_WORDS_KEY, None)
+    if HTMLWordMeaning.enabled and changed:
+        _rebuild_words(session, HTMLWordMeaning.affected_words(changed, set(), set()))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _forget_affected_objects(session: Session, _) -> None:
+    session.info.pop(AFFECTED_KEY, None)
+    session.info.pop(CHANGED_WORDS_KEY, None)
+
+
+def _rebuild_words(session: Session, word_ids: Set[int]) -> None:
+    if not word_ids:
+        return
+
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, HTMLExportWord) and obj.id in word_ids or \
+                isinstance(obj, HTMLExportDefinition) and obj.word_id in word_ids:
+            session.expire(obj)
+    HTMLWordMeaning._rebuild(sorted(word_ids))
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains a registry of HTML export styles.
+Each style holds all templates used by `HTMLExportWord` and `HTMLExportDefinition`,
+so templates are built once at import time instead of on every call,
+and a new style can be registered without changing the model classes.
+
+<details><summary>Show Examples</summary><p>
+```python
+register_style(get_style("normal")._replace(name="bold_cpx", complex="<b>%s</b>"))
+HTMLExportWord.html_all_by_name("pru*", style="bold_cpx")
+```
+</p></details>
+"""
+from typing import Dict, NamedTuple
+
+
+class WordTags(NamedTuple):
+    """Templates of the word's technical values"""
+    affixes: str
+    match: str
+    rank: str
+    source: str
+    type: str
+    used_in: str
+    year: str
+    technical: str
+
+
+class EnglishDefinitionTags(NamedTuple):
+    """Templates of `HTMLExportDefinition.export_for_english` parts"""
+    grammar: str
+    case_tags: str
+    body: str
+    definition: str
+    """*Takes a mapping with the definition's id and content*"""
+    line: str
+    word_name: str
+    word_origin: str
+
+
+class LoglanDefinitionTags(NamedTuple):
+    """Templates of `HTMLExportDefinition.export_for_loglan` parts"""
+    usage: str
+    grammar: str
+    body: str
+    case_tags: str
+    definition: str
+    """*Takes a mapping with the definition's id and content*"""
+
+
+class HTMLStyle(NamedTuple):
+    """All templates of one HTML design style"""
+    name: str
+    words: str
+    word: str
+    """*Takes the word's id, name and meanings*"""
+    meaning: str
+    """*Takes a mapping with mid, technical, definitions and used_in*"""
+    meaning_used_in: str
+    meaning_end: str
+    origin: str
+    complex: str
+    word_tags: WordTags
+    english: EnglishDefinitionTags
+    loglan: LoglanDefinitionTags
+    keys: str
+    key: str
+    """*Takes the key's id, the key and its translations*"""
+
+
+HTML_STYLES: Dict[str, HTMLStyle] = {}
+"""*Registered styles by name*"""
+
+
+def register_style(style: HTMLStyle) -> HTMLStyle:
+    """
+    Add the style to the registry or replace the style with the same name
+    Args:
+        style: HTMLStyle
+    Returns:
+        The same style
+    """
+    HTML_STYLES[style.name] = style
+    return style
+
+
+def get_style(name: str) -> HTMLStyle:
+    """
+    Get the registered style by name
+    Args:
+        name: Name of the style
+    Returns:
+        HTMLStyle
+    Raises:
+        KeyError: If the style is not registered
+    """
+    return HTML_STYLES[name]
+
+
+register_style(HTMLStyle(
+    name="normal",
+    words='<div class="words">\n%s\n</div>\n',
+    word='<div class="word" wid="%s">\n'
+         '<div class="word_line"><span class="word_name">%s</span>,</div>\n'
+         '<div class="meanings">\n%s\n</div>\n</div>',
+    meaning='<div class="meaning" id="%(mid)s">\n'
+            '<div class="technical">%(technical)s</div>\n'
+            '<div class="definitions">\n%(definitions)s\n</div>\n%(used_in)s',
+    meaning_used_in='<div class="used_in">Used In: %s</div>\n</div>',
+    meaning_end='</div>',
+    origin='<span class="m_origin">&lt;%s&gt;</span> ',
+    complex='<a class="m_cpx">%s</a>',
+    word_tags=WordTags(
+        affixes='<span class="m_afx">%s</span> ', match='<span class="m_match">%s</span> ',
+        rank='<span class="m_rank">%s</span>', source='<span class="m_author">%s</span> ',
+        type='<span class="m_type">%s</span> ', used_in='<span class="m_use">%s</span>',
+        year='<span class="m_year">%s</span> ', technical='<span class="m_technical">%s</span>'),
+    english=EnglishDefinitionTags(
+        grammar='<span class="dg">(%s)</span>',
+        case_tags='<span class="dt">[%s]</span> ',
+        body=' <span class="db">%s</span>',
+        definition='<span class="definition eng" id=%(id)s>%(content)s</span>',
+        line='<div class="d_line">%s</div>',
+        word_name='<span class="w_name">%s</span>, ',
+        word_origin='<span class="w_origin">&lt;%s&gt;</span> '),
+    loglan=LoglanDefinitionTags(
+        usage='<span class="du">%s</span> ', grammar='<span class="dg">(%s)</span> ',
+        body='<span class="db">%s</span>', case_tags=' <span class="dt">[%s]</span>',
+        definition='<div class="definition log" id=%(id)s>%(content)s</div>'),
+    keys='<div class="keys">\n%s\n</div>\n',
+    key='<div class="key" kid="%s">\n'
+        '<div class="key_line"><span class="key_name">%s</span></div>\n'
+        '<div class="translations">\n%s\n</div>\n</div>',
+))
+
+register_style(HTMLStyle(
+    name="ultra",
+    words='<ws>\n%s\n</ws>\n',
+    word='<w wid="%s"><wl>%s,</wl>\n<ms>\n%s\n</ms>\n</w>',
+    meaning='<m>\n<t>%(technical)s</t>\n<ds>\n%(definitions)s\n</ds>\n%(used_in)s',
+    meaning_used_in='<us>Used In: %s</us>\n</m>',
+    meaning_end='</m>',
+    origin='<o>&lt;%s&gt;</o> ',
+    complex='<cpx>%s</cpx>',
+    word_tags=WordTags(
+        affixes='<afx>%s</afx> ', match='%s ', rank='%s', source='%s ', type='%s ',
+        used_in='<use>%s</use>', year='%s ', technical='<tec>%s</tec>'),
+    english=EnglishDefinitionTags(
+        grammar='(%s)', case_tags='[%s] ', body=' %s', definition='<de>%(content)s</de>',
+        line='<ld>%s</ld>', word_name='<wn>%s</wn>, ', word_origin='<o>&lt;%s&gt;</o> '),
+    loglan=LoglanDefinitionTags(
+        usage='<du>%s</du> ', grammar='(%s) ', body='%s', case_tags=' [%s]',
+        definition='<dl>%(content)s</dl>'),
+    keys='<ks>\n%s\n</ks>\n',
+    key='<kw kid="%s"><kl>%s</kl>\n<ts>\n%s\n</ts>\n</kw>',
+))
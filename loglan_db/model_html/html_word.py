@@ -7,15 +7,25 @@ from __future__ import annotations
 
 import fnmatch
 from dataclasses import dataclass
-from itertools import groupby
-from typing import Union, Optional, List
+from itertools import groupby, islice
+from typing import Dict, Iterable, Iterator, Union, Optional, List
+
+from sqlalchemy import select
+from sqlalchemy.orm import contains_eager
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql import Select
 
 from loglan_db import db
 from loglan_db.model_db.addons.addon_word_getter import AddonWordGetter
+from loglan_db.model_db.base_connect_tables import t_connect_keys
 from loglan_db.model_db.base_event import BaseEvent
+from loglan_db.model_db.base_key import BaseKey
+from loglan_db.model_db.base_type import BaseType
 from loglan_db.model_db.base_word import BaseWord
 from loglan_db.model_export import AddonExportWordConverter
 from loglan_db.model_html import DEFAULT_HTML_STYLE
+from loglan_db.model_html.html_cache import cached_html
+from loglan_db.model_html.html_style import get_style
 
 
 @dataclass
@@ -27,6 +37,15 @@ class Meaning:
     used_in: str
 
 
+@dataclass
+class PrefetchedRelations:
+    """Word's related data loaded in advance for the whole result set"""
+    authors: List[str]
+    affixes: List[str]
+    complexes: List[str]
+    definitions: list
+
+
 class AddonWordTranslator:
     """
     Additional methods for HTMLExportWord class
@@ -55,11 +74,13 @@ class AddonWordTranslator:
         return any(map(lambda x: fnmatch.fnmatchcase(x, x_key), current_keys))
 
     @staticmethod
+    @cached_html()
     def translation_by_key(
             key: str, language: str = None, style: str = DEFAULT_HTML_STYLE,
             event_id: Union[BaseEvent, int, str] = None, case_sensitive: bool = False) -> Optional[str]:
         """
         Get information about loglan words by key in a foreign language
+        The result is cached if the result cache is enabled (see `html_cache`)
         Args:
             key:
             language:
@@ -69,19 +90,124 @@ class AddonWordTranslator:
         Returns:
 
         """
+        current_key = key if case_sensitive else key.lower()
+        definitions = AddonWordTranslator.definitions_matching_key(
+            key=key, language=language, event_id=event_id, case_sensitive=case_sensitive)
 
-        words = HTMLExportWord.by_key(
-            key=key, language=language, event_id=event_id,
-            case_sensitive=case_sensitive).all()
-
-        if not words:
+        if not definitions:
             return None
 
+        return '\n'.join([
+            d.export_for_english(current_key, style) for d in definitions]).strip()
+
+    @staticmethod
+    def iter_translation_by_key(
+            key: str, language: str = None, style: str = DEFAULT_HTML_STYLE,
+            event_id: Union[BaseEvent, int, str] = None, case_sensitive: bool = False,
+            batch_size: int = 500) -> Iterator[str]:
+        """
+        Yield the result of `translation_by_key` definition by definition,
+        reading definitions from a server-side cursor in batches,
+        e.g. for Flask's `Response(generator)`
+        Args:
+            key:
+            language:
+            style:
+            event_id:
+            case_sensitive:
+            batch_size: Number of rows fetched at once
+        Returns:
+            Iterator of HTML fragments, nothing if no definitions found
+        """
         current_key = key if case_sensitive else key.lower()
-        blocks = [word.definitions_by_key(
-            key=current_key, style=style, case_sensitive=case_sensitive) for word in words]
+        definitions = AddonWordTranslator.iter_definitions_matching_key(
+            key=key, language=language, event_id=event_id,
+            case_sensitive=case_sensitive, batch_size=batch_size)
+        for number, definition in enumerate(definitions):
+            html = definition.export_for_english(current_key, style)
+            yield f"\n{html}" if number else html
 
-        return '\n'.join(blocks).strip()
+    @staticmethod
+    def definitions_matching_key(
+            key: str, language: str = None, event_id: Union[BaseEvent, int, str] = None,
+            case_sensitive: bool = False) -> list:
+        """
+        Get definitions with the specified key together with their source words
+        and the words' types in one query, ordered by word's name.
+        Keys are pre-filtered with LIKE in DB and checked with fnmatch
+        the same way as `definitions_by_key` does.
+        Args:
+            key:
+            language:
+            event_id:
+            case_sensitive:
+        Returns:
+            List of HTMLExportDefinition
+        """
+        return list(AddonWordTranslator.iter_definitions_matching_key(
+            key=key, language=language, event_id=event_id, case_sensitive=case_sensitive))
+
+    @staticmethod
+    def iter_definitions_matching_key(
+            key: str, language: str = None, event_id: Union[BaseEvent, int, str] = None,
+            case_sensitive: bool = False, batch_size: int = None) -> Iterator:
+        """
+        Yield definitions of `definitions_matching_key` one by one
+        Args:
+            key:
+            language:
+            event_id:
+            case_sensitive:
+            batch_size: Number of rows fetched at once (Default value = None, all rows)
+        Returns:
+            Iterator of HTMLExportDefinition
+        """
+        if not event_id:
+            event_id = BaseEvent.latest_id()
+        event_id = event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
+
+        request = AddonWordTranslator._definitions_matching_key_select(
+            key=key, language=language, event_id=event_id, case_sensitive=case_sensitive)
+        if batch_size:
+            request = request.execution_options(yield_per=batch_size)
+        return AddonWordTranslator._unique_matching_key(
+            db.session.execute(request), key, case_sensitive)
+
+    @staticmethod
+    def _definitions_matching_key_select(
+            key: str, language: str, event_id: int, case_sensitive: bool) -> Select:
+        """
+        Statement of `iter_definitions_matching_key`, which selects
+        (definition, key's word) with LIKE pre-filtered keys
+        """
+        word = HTMLExportWord
+        definition = word._definitions.property.mapper.class_
+        like_key = key.replace("*", "%")
+
+        request = select(definition, BaseKey.word) \
+            .join(t_connect_keys, t_connect_keys.c.DID == definition.id) \
+            .join(BaseKey, BaseKey.id == t_connect_keys.c.KID) \
+            .join(definition._source_word) \
+            .options(contains_eager(definition._source_word).joinedload(word._type)) \
+            .filter(BaseKey.word.like(like_key) if case_sensitive
+                    else db.func.lower(BaseKey.word).like(like_key.lower()))
+        if language:
+            request = request.filter(BaseKey.language == language)
+        return word._filter_event(event_id, request) \
+            .order_by(word.name, word.id, definition.id)
+
+    @staticmethod
+    def _unique_matching_key(rows: Iterable, key: str, case_sensitive: bool) -> Iterator:
+        """
+        Check keys of (definition, key's word) rows with fnmatch and skip repeated definitions
+        """
+        current_key = key if case_sensitive else key.lower()
+        found = set()
+        for item, key_word in rows:
+            key_word = key_word if case_sensitive else key_word.lower()
+            if item.id not in found and fnmatch.fnmatchcase(key_word, current_key):
+                found.add(item.id)
+                yield item
 
 
 class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExportWordConverter):
@@ -92,69 +218,232 @@ class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExport
     _definitions = db.relationship(
         "HTMLExportDefinition", lazy='dynamic', back_populates="_source_word", viewonly=True)
 
+    _prefetched: Optional[PrefetchedRelations] = None
+    _materialized: Optional[Meaning] = None
+
+    meaning_store = None
+    """*Storage of precomputed meanings, see `loglan_db.model_html.html_meaning`*"""
+
+    @classmethod
+    def prefetch(cls, words: List[HTMLExportWord], style: str = None) -> List[HTMLExportWord]:
+        """
+        Load types, authors, derivatives and definitions of all words
+        with a fixed number of queries, so rendering does not query DB for each word
+        If the meaning store is enabled, precomputed meanings of the style
+        are read instead and relations are loaded only for words without them
+        Args:
+            words: Words to render
+            style: HTML design style of precomputed meanings (Default value = None)
+        Returns:
+            The same words
+        """
+        if style and cls.meaning_store is not None:
+            meanings = cls.meaning_store.get_many([word.id for word in words], style)
+            for word in words:
+                word._materialized = meanings.get(word.id)
+            words = [word for word in words if word._materialized is None]
+
+        if not words:
+            return words
+
+        word_ids = [word.id for word in words]
+        types = {word_type.id: word_type for word_type in BaseType.query.all()}
+        return cls._attach_prefetched(
+            words, types, cls._bulk_authors(word_ids), cls._bulk_derivatives(word_ids, types),
+            db.session.execute(cls._definitions_select(word_ids)).scalars())
+
     @classmethod
+    def _definitions_select(cls, word_ids: List[int]) -> Select:
+        """
+        Statement of all definitions of words ordered by word
+        """
+        definition_class = cls._definitions.property.mapper.class_
+        return select(definition_class).filter(definition_class.word_id.in_(word_ids)) \
+            .order_by(definition_class.word_id, definition_class.id)
+
+    @staticmethod
+    def _attach_prefetched(
+            words: List[HTMLExportWord], types: Dict[int, BaseType],
+            authors: Dict[int, List[str]], derivatives: tuple,
+            definitions: Iterable) -> List[HTMLExportWord]:
+        """
+        Attach loaded relations to words (see `prefetch`)
+        Args:
+            words: Words to render
+            types: Dictionary {type_id: BaseType}
+            authors: Result of `_bulk_authors`
+            derivatives: Result of `_bulk_derivatives`
+            definitions: Definitions of words ordered by word_id
+        Returns:
+            The same words
+        """
+        affixes, complexes = derivatives
+        definitions = {word_id: list(items) for word_id, items
+                       in groupby(definitions, lambda d: d.word_id)}
+
+        for word in words:
+            set_committed_value(word, "_type", types.get(word.type_id))
+            word._prefetched = PrefetchedRelations(
+                authors=authors[word.id], affixes=affixes[word.id],
+                complexes=complexes[word.id], definitions=definitions.get(word.id, []))
+        return words
+
+    @property
+    def e_source(self) -> str:
+        if self._prefetched is None:
+            return super().e_source
+        return self._format_source(self._prefetched.authors, self.notes)
+
+    @property
+    def e_affixes(self) -> str:
+        if self._prefetched is None:
+            return super().e_affixes
+        return self._format_affixes(self._prefetched.affixes)
+
+    @classmethod
+    @cached_html("prefetch")
     def html_all_by_name(
             cls, name: str, style: str = DEFAULT_HTML_STYLE,
             event_id: Union[BaseEvent, int, str] = None,
-            case_sensitive: bool = False) -> Optional[str]:
+            case_sensitive: bool = False, prefetch: bool = True) -> Optional[str]:
         """
         Convert all words found by name into one HTML string
+        The result is cached if the result cache is enabled (see `html_cache`)
         Args:
             name: Name of the search word
             style: HTML design style
             event_id:
             case_sensitive:
+            prefetch: Load related data for all words at once (see `prefetch()`)
         Returns:
 
         """
 
-        words_template = {
-            "normal": '<div class="words">\n%s\n</div>\n',
-            "ultra": '<ws>\n%s\n</ws>\n',
-        }
-
         if not event_id:
-            event_id = BaseEvent.latest().id
+            event_id = BaseEvent.latest_id()
 
-        event_id = int(event_id) if isinstance(event_id, (int, str)) else BaseEvent.id
+        event_id = event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
 
         words = cls.by_name(
             name=name, event_id=event_id,
             case_sensitive=case_sensitive
         ).all()
+        return cls.html_all(words, style, prefetch)
 
+    @classmethod
+    def html_all(
+            cls, words: list, style: str = DEFAULT_HTML_STYLE,
+            prefetch: bool = True) -> Optional[str]:
+        """
+        Convert specified words into one HTML string
+        Args:
+            words: List of words
+            style: HTML design style
+            prefetch: Load related data for all words at once (see `prefetch()`)
+        Returns:
+            HTML string or None if there are no words
+        """
         if not words:
             return None
 
-        items = cls._get_stylized_words(words, style)
+        if prefetch:
+            cls.prefetch(words, style)
 
-        return words_template[style] % "\n".join(items)
+        try:
+            items = cls._get_stylized_words(words, style)
+        finally:
+            for word in words:
+                word._prefetched, word._materialized = None, None
 
-    @staticmethod
+        return get_style(style).words % "\n".join(items)
+
+    @classmethod
+    def iter_html_all_by_name(
+            cls, name: str, style: str = DEFAULT_HTML_STYLE,
+            event_id: Union[BaseEvent, int, str] = None,
+            case_sensitive: bool = False, batch_size: int = 500) -> Iterator[str]:
+        """
+        Yield the result of `html_all_by_name` word by word,
+        reading words from a server-side cursor and prefetching
+        their related data batch by batch, e.g. for Flask's `Response(generator)`
+        Args:
+            name: Name of the search word
+            style: HTML design style
+            event_id:
+            case_sensitive:
+            batch_size: Number of words fetched and prefetched at once
+        Returns:
+            Iterator of HTML fragments, nothing if no words found
+        """
+        if not event_id:
+            event_id = BaseEvent.latest_id()
+
+        event_id = event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
+
+        request = cls.by_name(name=name, event_id=event_id, case_sensitive=case_sensitive)
+        words = cls._iter_prefetched(iter(request.yield_per(batch_size)), style, batch_size)
+
+        items = (cls._get_stylized_word(word_name, words_list, style)
+                 for word_name, words_list in groupby(words, lambda ent: ent.name))
+        first = next(items, None)
+        if first is None:
+            return
+
+        head, tail = get_style(style).words.split("%s")
+        yield f"{head}{first}"
+        for item in items:
+            yield f"\n{item}"
+        yield tail
+
+    @classmethod
+    def _iter_prefetched(
+            cls, words: Iterator[HTMLExportWord], style: str,
+            batch_size: int) -> Iterator[HTMLExportWord]:
+        """
+        Prefetch related data of words batch by batch while iterating them
+        """
+        while True:
+            batch = list(islice(words, batch_size))
+            if not batch:
+                return
+            cls.prefetch(batch, style)
+            try:
+                yield from batch
+            finally:
+                for word in batch:
+                    word._prefetched, word._materialized = None, None
+
+    @classmethod
     def _get_stylized_words(
-            words: list, style: str = DEFAULT_HTML_STYLE) -> List[str]:
+            cls, words: list, style: str = DEFAULT_HTML_STYLE) -> List[str]:
+        """
+
+        Args:
+            words:
+            style:
+
+        Returns:
+
         """
+        return [cls._get_stylized_word(word_name, words_list, style)
+                for word_name, words_list in groupby(words, lambda ent: ent.name)]
 
+    @classmethod
+    def _get_stylized_word(
+            cls, word_name: str, words: Iterable[HTMLExportWord],
+            style: str = DEFAULT_HTML_STYLE) -> str:
+        """
+        Combine meanings of words with the same name into one block
         Args:
+            word_name:
             words:
             style:
 
         Returns:
 
         """
-        word_template = {
-            "normal": '<div class="word" wid="%s">\n'
-                      '<div class="word_line"><span class="word_name">%s</span>,</div>\n'
-                      '<div class="meanings">\n%s\n</div>\n</div>',
-            "ultra": '<w wid="%s"><wl>%s,</wl>\n<ms>\n%s\n</ms>\n</w>',
-        }
-        grouped_words = groupby(words, lambda ent: ent.name)
-        group_words = {k: list(g) for k, g in grouped_words}
-        items = []
-        for word_name, words_list in group_words.items():
-            meanings = "\n".join([word.html_meaning(style) for word in words_list])
-            items.append(word_template[style] % (word_name.lower(), word_name, meanings))
-        return items
+        meanings = "\n".join([word.html_meaning(style) for word in words])
+        return get_style(style).word % (word_name.lower(), word_name, meanings)
 
     def html_origin(self, style: str = DEFAULT_HTML_STYLE):
         """
@@ -173,9 +462,7 @@ class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExport
 
         origin = self._generate_origin(orig, orig_x)
 
-        if style == "normal":
-            return f'<span class="m_origin">&lt;{origin}&gt;</span> '
-        return f'<o>&lt;{origin}&gt;</o> '
+        return get_style(style).origin % origin
 
     @staticmethod
     def _generate_origin(orig: str, orig_x: str) -> str:
@@ -201,7 +488,8 @@ class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExport
         :param style:
         :return:
         """
-        return [d.export_for_loglan(style=style) for d in self.definitions]
+        definitions = self._prefetched.definitions if self._prefetched else self.definitions
+        return [d.export_for_loglan(style=style) for d in definitions]
 
     def meaning(self, style: str = DEFAULT_HTML_STYLE) -> Meaning:
         """
@@ -221,13 +509,10 @@ class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExport
         return tag % value if value else default_value
 
     def used_in_as_html(self, style: str = DEFAULT_HTML_STYLE) -> str:
-        tags = {
-            "normal": '<a class="m_cpx">%s</a>',
-            "ultra": '<cpx>%s</cpx>',
-        }
-        return " |&nbsp;".join(sorted(
-            {tags[style] % cpx.name for cpx in filter(None, self.complexes)}
-        ))
+        tag = get_style(style).complex
+        names = self._prefetched.complexes if self._prefetched \
+            else [cpx.name for cpx in filter(None, self.complexes)]
+        return " |&nbsp;".join(sorted({tag % name for name in names}))
 
     def get_styled_values(self, style: str = DEFAULT_HTML_STYLE) -> tuple:
         """
@@ -238,23 +523,14 @@ class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExport
         Returns:
 
         """
-        tags = {
-            "normal": [
-                '<span class="m_afx">%s</span> ', '<span class="m_match">%s</span> ',
-                '<span class="m_rank">%s</span>', '<span class="m_author">%s</span> ',
-                '<span class="m_type">%s</span> ', '<span class="m_use">%s</span>',
-                '<span class="m_year">%s</span> ', '<span class="m_technical">%s</span>'],
-            "ultra": [
-                '<afx>%s</afx> ', '%s ', '%s', '%s ', '%s ',
-                '<use>%s</use>', '%s ', '<tec>%s</tec>'],
-        }
+        tags = get_style(style).word_tags
 
         values = [self.e_affixes, self.match, self.rank, self.e_source, self.type.type,
                   self.used_in_as_html(style), self.e_year, None]
-        default_values = [str(), str(), str(), str(), str(), None, str(), tags[style][-1]]
+        default_values = [str(), str(), str(), str(), str(), None, str(), tags.technical]
 
         return tuple(self._tagger(tag, value, default_value) for tag, value, default_value
-                     in zip(tags[style], values, default_values))
+                     in zip(tags, values, default_values))
 
     def html_meaning(self, style: str = DEFAULT_HTML_STYLE) -> str:
         """
@@ -265,19 +541,10 @@ class HTMLExportWord(BaseWord, AddonWordGetter, AddonWordTranslator, AddonExport
         Returns:
 
         """
-        n_l = "\n"
-        meaning = self.meaning(style)
-        if style == "normal":
-            used_in_list = f'<div class="used_in">Used In: ' \
-                           f'{meaning.used_in}</div>\n</div>' \
-                if meaning.used_in else "</div>"
-            return f'<div class="meaning" id="{meaning.mid}">\n' \
-                   f'<div class="technical">{meaning.technical}</div>\n' \
-                   f'<div class="definitions">{n_l}' \
-                   f'{n_l.join(meaning.definitions)}\n</div>\n{used_in_list}'
-
-        used_in_list = f'<us>Used In: {meaning.used_in}</us>\n</m>' \
-            if meaning.used_in else '</m>'
-        return f'<m>\n<t>{meaning.technical}</t>\n' \
-               f'<ds>{n_l}' \
-               f'{n_l.join(meaning.definitions)}\n</ds>\n{used_in_list}'
+        templates = get_style(style)
+        meaning = self._materialized or self.meaning(style)
+        used_in_list = templates.meaning_used_in % meaning.used_in \
+            if meaning.used_in else templates.meaning_end
+        return templates.meaning % {
+            "mid": meaning.mid, "technical": meaning.technical,
+            "definitions": "\n".join(meaning.definitions), "used_in": used_in_list, }
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains a bulk importer for LOD dictionary SQL model.
+It reads text files made by export() methods (see `loglan_db.model_export`)
+and loads them with batched INSERT statements inside one transaction per table.
+Connecting tables are rebuilt from the imported data. On PostgreSQL id sequences
+are moved past imported ids, so later inserts without explicit ids do not fail.
+
+Keys of an existing database can be re-linked with `link_all_keys`.
+"""
+
+import os
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Table, func, select, tuple_
+from sqlalchemy.sql import Select
+
+from loglan_db import db, log
+from loglan_db.model_db.base_connect_tables import \
+    t_connect_authors, t_connect_words, t_connect_keys
+from loglan_db.model_db.base_definition import BaseDefinition
+from loglan_db.model_db.base_key import BaseKey
+from loglan_db.model_export import ExportAuthor, ExportEvent, ExportSetting, \
+    ExportSyllable, ExportType, ExportWord, ExportDefinition, ExportWordSpell
+
+
+def read_export_file(directory: str, model) -> List[str]:
+    """
+    Read lines of the model's text file made by `loglan_db.model_export.export_to_files`
+    Args:
+        directory: Directory with text files
+        model: One of export_models_pg classes
+    Returns:
+        List of non-empty lines
+    """
+    path = os.path.join(directory, f"{model.__tablename__}.txt")
+    with open(path, encoding="utf-8") as file:
+        return [line.rstrip("\n") for line in file if line.strip()]
+
+
+def insert_rows(table: Table, rows: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Insert rows into the table with executemany batches.
+    The caller is responsible for committing the transaction.
+    Args:
+        table: Table to insert rows into
+        rows: List of dictionaries {column: value}
+        batch_size: Number of rows in one batch (Default value = 1000)
+    Returns:
+        Number of inserted rows
+    """
+    for start in range(0, len(rows), batch_size):
+        db.session.execute(table.insert(), rows[start:start + batch_size])
+    return len(rows)
+
+
+def id_sequence_statement(table: Table) -> Select:
+    """
+    PostgreSQL statement, which sets the sequence of the table's id column
+    to the maximum id, so the next generated id does not conflict with existing ones
+    Args:
+        table: Table with the 'id' column
+    Returns:
+        Select statement
+    """
+    max_id = func.max(table.c.id)
+    return select(func.setval(
+        func.pg_get_serial_sequence(table.name, "id"),
+        func.coalesce(max_id, 1), max_id.isnot(None)))
+
+
+def import_table(table: Table, rows: List[Dict[str, Any]], batch_size: int = 1000) -> int:
+    """
+    Insert rows into the table within a single transaction
+    Args:
+        table: Table to insert rows into
+        rows: List of dictionaries {column: value}
+        batch_size: Number of rows in one batch (Default value = 1000)
+    Returns:
+        Number of inserted rows
+    """
+    try:
+        count = insert_rows(table, rows, batch_size)
+        if db.engine.dialect.name == "postgresql" and "id" in table.c:
+            db.session.execute(id_sequence_statement(table))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    log.info("%s: %d rows imported", table.name, count)
+    return count
+
+
+def import_from_files(
+        directory: str, language: str = "en",
+        batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Import all text files made by export_to_files() into an empty database
+    Args:
+        directory: Directory with text files
+        language: Language of definitions and their keys (Default value = "en")
+        batch_size: Number of rows in one batch (Default value = 1000)
+    Returns:
+        Dictionary {table name: number of imported rows}
+    """
+    result = {}
+
+    for model in (ExportAuthor, ExportEvent, ExportSetting, ExportSyllable, ExportType):
+        rows = [model.import_(line) for line in read_export_file(directory, model)]
+        result[model.__table__.name] = import_table(model.__table__, rows, batch_size)
+    ExportEvent.latest_cache.invalidate()
+    ExportType.registry.invalidate()
+
+    spells = {spell["id_old"]: spell for spell in map(
+        ExportWordSpell.import_, read_export_file(directory, ExportWordSpell))}
+    words = [ExportWord.import_(line) for line in read_export_file(directory, ExportWord)]
+    result[ExportWord.__table__.name] = import_table(
+        ExportWord.__table__, _prepare_words(words, spells), batch_size)
+
+    word_ids = dict(db.session.query(ExportWord.id_old, ExportWord.id))
+    definitions = [{
+        **{key: value for key, value in item.items() if key != "word_id_old"},
+        "word_id": word_ids[item["word_id_old"]], "language": language, }
+        for item in map(ExportDefinition.import_, read_export_file(directory, ExportDefinition))]
+    result[ExportDefinition.__table__.name] = import_table(
+        ExportDefinition.__table__, definitions, batch_size)
+
+    result[t_connect_authors.name] = import_table(
+        t_connect_authors, _prepare_connect_authors(words, word_ids), batch_size)
+    result[t_connect_words.name] = import_table(
+        t_connect_words, _prepare_connect_words(words, word_ids), batch_size)
+
+    key_pairs = _extract_keys(db.session.query(
+        BaseDefinition.id, BaseDefinition.body, BaseDefinition.language))
+    result[BaseKey.__table__.name] = import_table(
+        BaseKey.__table__, _prepare_keys(key_pairs), batch_size)
+    result[t_connect_keys.name] = import_table(
+        t_connect_keys, _prepare_connect_keys(key_pairs), batch_size)
+
+    return result
+
+
+def _prepare_words(
+        words: List[Dict[str, Any]],
+        spells: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Combine words' data with their spells and resolve types
+    Args:
+        words: Results of ExportWord.import_()
+        spells: Results of ExportWordSpell.import_() by id_old
+    Returns:
+        List of rows for the words table
+    """
+    type_ids = {
+        (word_type, type_x): type_id for type_id, word_type, type_x
+        in db.session.query(ExportType.id, ExportType.type, ExportType.type_x)}
+
+    return [{
+        "id_old": word["id_old"], "name": spells[word["id_old"]]["name"],
+        "type": type_ids[(word["type"], word["type_x"])],
+        "event_start": spells[word["id_old"]]["event_start_id"],
+        "event_end": spells[word["id_old"]]["event_end_id"],
+        "match": word["match"], "rank": word["rank"], "year": word["year"],
+        "notes": word["notes"], "origin": word["origin"], "origin_x": word["origin_x"],
+        "TID_old": word["TID_old"], } for word in words]
+
+
+def _prepare_connect_authors(
+        words: List[Dict[str, Any]], word_ids: Dict[int, int]) -> List[Dict[str, int]]:
+    """
+    Args:
+        words: Results of ExportWord.import_()
+        word_ids: Dictionary {id_old: id}
+    Returns:
+        List of rows for the connect_authors table
+    """
+    author_ids = dict(db.session.query(ExportAuthor.abbreviation, ExportAuthor.id))
+    pairs = {
+        (author_ids[abbreviation], word_ids[word["id_old"]])
+        for word in words for abbreviation in word["authors"]
+        if abbreviation in author_ids}
+    return [{"AID": aid, "WID": wid} for aid, wid in sorted(pairs)]
+
+
+def _prepare_connect_words(
+        words: List[Dict[str, Any]], word_ids: Dict[int, int]) -> List[Dict[str, int]]:
+    """
+    Restore derivatives from affixes and complexes of words
+    Args:
+        words: Results of ExportWord.import_()
+        word_ids: Dictionary {id_old: id}
+    Returns:
+        List of rows for the connect_words table
+    """
+    types = {type_id: (word_type, group) for type_id, word_type, group
+             in db.session.query(ExportType.id, ExportType.type, ExportType.group)}
+    affixes, complexes = defaultdict(list), defaultdict(list)
+
+    for word_id, name, type_id in db.session.query(
+            ExportWord.id, ExportWord.name, ExportWord.type_id):
+        word_type, group = types[type_id]
+        if word_type == "Afx":
+            affixes[name.replace("-", "")].append(word_id)
+        if group == "Cpx":
+            complexes[name].append(word_id)
+
+    pairs = set()
+    for word in words:
+        parent_id = word_ids[word["id_old"]]
+        children = [affixes[name] for name in word["affixes"]] + \
+                   [complexes[name] for name in word["used_in"]]
+        pairs.update((parent_id, child_id) for ids in children for child_id in ids)
+    return [{"parent_id": parent_id, "child_id": child_id}
+            for parent_id, child_id in sorted(pairs)]
+
+
+def _extract_keys(
+        definitions: Iterable[Tuple[int, str, str]]) -> Set[Tuple[int, str, str]]:
+    """
+    Extract keys from definitions' bodies
+    Args:
+        definitions: Iterable of (id, body, language)
+    Returns:
+        Set of (definition id, key word, language)
+    """
+    return {(definition_id, key, language)
+            for definition_id, body, language in definitions
+            for key in re.findall(BaseDefinition.KEY_PATTERN, body)}
+
+
+def link_all_keys(
+        definition_ids: Optional[Iterable[int]] = None,
+        batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Extract keys from bodies of all (or specified) definitions,
+    create missing keys and link them with definitions.
+    Definitions are processed in batches with a fixed number of statements
+    per batch, existing keys and links are kept. Everything is committed at once.
+    Args:
+        definition_ids: Ids of definitions to process (Default value = None, all)
+        batch_size: Number of definitions in one batch (Default value = 1000)
+    Returns:
+        Dictionary with numbers of created "keys" and "links"
+    """
+    request = db.session.query(BaseDefinition.id) \
+        .filter(BaseDefinition.language.isnot(None)).order_by(BaseDefinition.id)
+    if definition_ids is not None:
+        request = request.filter(BaseDefinition.id.in_(set(definition_ids)))
+    ids = [definition_id for (definition_id, ) in request]
+
+    key_ids = _key_ids()
+    result = {"keys": 0, "links": 0}
+    try:
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            key_pairs = _extract_keys(db.session.query(
+                BaseDefinition.id, BaseDefinition.body, BaseDefinition.language)
+                .filter(BaseDefinition.id.in_(batch)))
+
+            new_keys = sorted({(word, language) for _, word, language in key_pairs} - set(key_ids))
+            if new_keys:
+                result["keys"] += insert_rows(BaseKey.__table__, [
+                    {"word": word, "language": language} for word, language in new_keys])
+                key_ids.update(_key_ids(new_keys))
+
+            existing_links = set(db.session.query(
+                t_connect_keys.c.KID, t_connect_keys.c.DID).filter(t_connect_keys.c.DID.in_(batch)))
+            new_links = {(key_ids[(word, language)], definition_id)
+                         for definition_id, word, language in key_pairs} - existing_links
+            result["links"] += insert_rows(
+                t_connect_keys, [{"KID": kid, "DID": did} for kid, did in sorted(new_links)])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    log.info("Keys linked for %d definitions: %d keys and %d links created",
+             len(ids), result["keys"], result["links"])
+    return result
+
+
+def _key_ids(keys: Optional[List[Tuple[str, str]]] = None) -> Dict[Tuple[str, str], int]:
+    """
+    Args:
+        keys: List of (word, language) (Default value = None, all keys)
+    Returns:
+        Dictionary {(word, language): key id}
+    """
+    request = db.session.query(BaseKey.id, BaseKey.word, BaseKey.language)
+    if keys is not None:
+        request = request.filter(tuple_(BaseKey.word, BaseKey.language).in_(keys))
+    return {(word, language): key_id for key_id, word, language in request}
+
+
+def _prepare_keys(key_pairs: Set[Tuple[int, str, str]]) -> List[Dict[str, str]]:
+    """
+    Args:
+        key_pairs: Set of (definition id, key word, language)
+    Returns:
+        List of rows for the keys table, which do not exist yet
+    """
+    existing_keys = set(db.session.query(BaseKey.word, BaseKey.language))
+    new_keys = {(word, language) for _, word, language in key_pairs} - existing_keys
+    return [{"word": word, "language": language} for word, language in sorted(new_keys)]
+
+
+def _prepare_connect_keys(key_pairs: Set[Tuple[int, str, str]]) -> List[Dict[str, int]]:
+    """
+    Args:
+        key_pairs: Set of (definition id, key word, language)
+    Returns:
+        List of rows for the connect_keys table
+    """
+    key_ids = {(word, language): key_id for key_id, word, language
+               in db.session.query(BaseKey.id, BaseKey.word, BaseKey.language)}
+    pairs = {(key_ids[(word, language)], definition_id)
+             for definition_id, word, language in key_pairs}
+    return [{"KID": kid, "DID": did} for kid, did in sorted(pairs)]
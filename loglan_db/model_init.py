@@ -3,11 +3,13 @@
 """
 Initial common functions for LOD Model Classes
 """
+from __future__ import annotations
 
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Set
+from typing import Any, Dict, Iterator, List, Optional, Set
 
-from loglan_db import db
+from loglan_db import db, log
 
 
 class InitBase:
@@ -46,13 +48,28 @@ class InitBase:
         :return:
         """
 
-    def import_(self):
+    @classmethod
+    def import_(cls, line: str) -> Dict[str, Any]:
         """
         Import txt data to DB
+        Convert a string made by export() into a dictionary of values
         Should be redefine in model's class
+        :param line: Formatted basic string
         :return:
         """
 
+    @staticmethod
+    def nullable(value: str) -> Optional[str]:
+        """
+        Convert exported 'None' string back to None
+        Args:
+            value:
+
+        Returns:
+
+        """
+        return None if value == str(None) else value
+
     @staticmethod
     def stringer(value) -> str:
         """
@@ -66,6 +83,40 @@ class InitBase:
         return str(value) if value else str()
 
 
+class Batch:
+    """
+    Unit of work for DBBase.save(), update() and delete() calls
+    See DBBase.batch()
+    """
+    SESSION_KEY = "loglan_db_batch"
+
+    def __init__(self, size: int = 1000):
+        self.size = size
+        """Number of changes to be flushed at once"""
+        self.count = 0
+        """Number of changes made within the batch"""
+        self._pending = 0
+
+    def register(self) -> None:
+        """
+        Count a change and flush the session when the batch size is reached
+        :return:
+        """
+        self.count += 1
+        self._pending += 1
+        if self._pending >= self.size:
+            db.session.flush()
+            self._pending = 0
+
+    @staticmethod
+    def current() -> Optional[Batch]:
+        """
+        Get the batch of the current session if exists
+        :return:
+        """
+        return db.session.info.get(Batch.SESSION_KEY)
+
+
 class DBBase:
     """Common methods and attributes for basic models"""
     created = db.Column(db.TIMESTAMP, default=datetime.now(), nullable=False)
@@ -74,13 +125,61 @@ class DBBase:
     __mapper__ = None
     id = None
 
+    @staticmethod
+    def _commit() -> None:
+        """
+        Commit the session or defer the commit if there is an active batch
+        :return:
+        """
+        batch = Batch.current()
+        if batch is None:
+            db.session.commit()
+            return
+        batch.register()
+
+    @staticmethod
+    @contextmanager
+    def batch(size: int = 1000) -> Iterator[Batch]:
+        """
+        Defer commits of save(), update() and delete() calls made within the context.
+        Changes are flushed every 'size' calls and committed once at the end.
+        All changes are rolled back if an exception is raised.
+        Nested batches are joined to the outer one.
+
+        Example:
+            with DBBase.batch(size=1000) as batch:
+                for word in words:
+                    word.update({"rank": "1.0"})
+            print(batch.count)
+
+        :param size: Number of changes to be flushed at once
+        :return: Batch object with number of changes in 'count' attribute
+        """
+        outer_batch = Batch.current()
+        if outer_batch is not None:
+            yield outer_batch
+            return
+
+        batch = Batch(size)
+        db.session.info[Batch.SESSION_KEY] = batch
+        try:
+            yield batch
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        finally:
+            db.session.info.pop(Batch.SESSION_KEY, None)
+
+        log.info("Batch committed: %d changes", batch.count)
+
     def save(self) -> None:
         """
         Add record to DB
         :return:
         """
         db.session.add(self)
-        db.session.commit()
+        self._commit()
 
     def update(self, data) -> None:
         """
@@ -90,7 +189,7 @@ class DBBase:
         """
         for key, item in data.items():
             setattr(self, key, item)
-        db.session.commit()
+        self._commit()
 
     def delete(self) -> None:
         """
@@ -98,7 +197,7 @@ class DBBase:
         :return:
         """
         db.session.delete(self)
-        db.session.commit()
+        self._commit()
 
     @classmethod
     def get_all(cls) -> List:
@@ -158,3 +257,47 @@ class DBBase:
         :return:
         """
         return {column.name for column in cls.__table__.columns if not column.foreign_keys}
+
+
+_INDEX_NAMES_SQL = {
+    "sqlite": "SELECT name FROM sqlite_master WHERE type = 'index'",
+    "postgresql": "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()",
+}
+
+
+def _existing_index_names(tables: List[str]) -> Set[str]:
+    """
+    Get names of all indexes in DB
+    SQLAlchemy's Inspector skips functional indexes, so the system catalog
+    is used for supported dialects
+    """
+    sql = _INDEX_NAMES_SQL.get(db.engine.dialect.name)
+    if sql:
+        return {name for (name, ) in db.session.execute(sql)}
+    inspector = db.inspect(db.engine)
+    return {index["name"] for table in tables for index in inspector.get_indexes(table)}
+
+
+def create_missing_indexes() -> List[str]:
+    """
+    Create indexes declared in models, which do not exist
+    in an existing database yet (db.create_all() skips existing tables)
+    All models should be imported before the call.
+    Returns:
+        List of created indexes' names
+    """
+    tables = set(db.inspect(db.engine).get_table_names())
+    existing = _existing_index_names(sorted(tables))
+    created = []
+
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        for index in sorted(table.indexes, key=lambda item: item.name):
+            if index.name not in existing:
+                index.create(bind=db.engine)
+                created.append(index.name)
+
+    if created:
+        log.info("Created indexes: %s", ", ".join(created))
+    return created
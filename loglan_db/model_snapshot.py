@@ -0,0 +1,470 @@
+# -*- coding: utf-8 -*-
+"""
+This module contains an optional in-memory read-only snapshot of LOD dictionary.
+It loads words, definitions, keys, types, authors and derivative links once
+and answers the same questions as `AddonWordGetter` (by_event, by_name, by_key)
+from hash indexes without any query to DB.
+Wildcard patterns are resolved with `WildcardIndex`,
+`AddonWordGetter` remains the SQL fallback.
+
+The snapshot is reloaded atomically when `BaseSetting.db_version` changes.
+
+<details><summary>Show Examples</summary><p>
+```python
+snapshot = DictionarySnapshot(check_interval=60)
+words = snapshot.by_key("test", language="en")
+```
+</p></details>
+"""
+from __future__ import annotations
+
+import datetime
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from loglan_db import db, log
+from loglan_db.model_db.base_author import BaseAuthor
+from loglan_db.model_db.base_connect_tables import \
+    t_connect_authors, t_connect_words, t_connect_keys
+from loglan_db.model_db.base_definition import BaseDefinition
+from loglan_db.model_db.base_event import BaseEvent
+from loglan_db.model_db.base_key import BaseKey
+from loglan_db.model_db.base_setting import BaseSetting
+from loglan_db.model_db.base_type import BaseType, TypeRecord
+from loglan_db.model_db.base_word import BaseWord
+
+
+class SnapshotWord(NamedTuple):
+    """Lightweight copy of the `BaseWord` row"""
+    id: int
+    name: str
+    type_id: int
+    event_start_id: int
+    event_end_id: Optional[int]
+    origin: Optional[str]
+    origin_x: Optional[str]
+    match: Optional[str]
+    rank: Optional[str]
+    year: Optional[datetime.date]
+    notes: Optional[dict]
+    id_old: int
+    TID_old: Optional[int]
+
+
+class SnapshotDefinition(NamedTuple):
+    """Lightweight copy of the `BaseDefinition` row"""
+    id: int
+    word_id: int
+    position: int
+    usage: Optional[str]
+    grammar_code: Optional[str]
+    slots: Optional[int]
+    case_tags: Optional[str]
+    body: str
+    language: Optional[str]
+    notes: Optional[str]
+
+
+class SnapshotKey(NamedTuple):
+    """Lightweight copy of the `BaseKey` row"""
+    id: int
+    word: str
+    language: str
+
+
+class SnapshotAuthor(NamedTuple):
+    """Lightweight copy of the `BaseAuthor` row"""
+    id: int
+    abbreviation: str
+    full_name: Optional[str]
+    notes: Optional[str]
+
+
+def like_to_regex(pattern: str, case_sensitive: bool = False) -> re.Pattern:
+    """
+    Convert SQL LIKE pattern (with '*' as an alias of '%') to compiled regex
+    Args:
+        pattern: LIKE pattern
+        case_sensitive: LIKE if True, ILIKE otherwise (Default value = False)
+    Returns:
+        Compiled regular expression for fullmatch
+    """
+    wildcards = {"%": ".*", "*": ".*", "_": "."}
+    regex = "".join(wildcards.get(char, re.escape(char)) for char in pattern)
+    return re.compile(regex, re.DOTALL if case_sensitive else re.IGNORECASE | re.DOTALL)
+
+
+def has_wildcards(pattern: str) -> bool:
+    """
+    Check if the LIKE pattern contains any wildcard ('%', '_' or '*')
+    """
+    return any(char in pattern for char in "%_*")
+
+
+class WildcardIndex:
+    """In-process index of strings for LIKE patterns with '*', '%' and '_' wildcards
+
+    Values are kept lower-cased in two sorted arrays: as is and reversed,
+    so patterns with a literal prefix ('bla*') or suffix ('*ona') are resolved
+    with binary search. Patterns with wildcards on both sides ('*ona*')
+    use a trigram index of the inner literal parts. Candidates are always
+    verified with the regex, so the result is the same as the one of LIKE/ILIKE.
+    """
+    NGRAM = 3
+
+    def __init__(self):
+        self._items: Dict[str, List[Tuple[str, int]]] = defaultdict(list)
+        self._forward: List[str] = []
+        self._backward: List[str] = []
+        self._ngrams: Dict[str, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+    def add(self, value: str, item_id: int) -> None:
+        """
+        Add the value with its item's id, `build()` should be called after all additions
+        """
+        self._items[value.lower()].append((value, item_id))
+
+    def build(self) -> WildcardIndex:
+        """
+        Build sorted arrays and the trigram index of added values
+        """
+        self._forward = sorted(self._items)
+        self._backward = sorted(value[::-1] for value in self._forward)
+        self._ngrams = defaultdict(set)
+        for value in self._forward:
+            for ngram in self._split_ngrams(value):
+                self._ngrams[ngram].add(value)
+        return self
+
+    @classmethod
+    def _split_ngrams(cls, value: str) -> Set[str]:
+        return {value[i:i + cls.NGRAM] for i in range(len(value) - cls.NGRAM + 1)}
+
+    @staticmethod
+    def _prefix_range(array: List[str], prefix: str) -> Tuple[int, int]:
+        return bisect_left(array, prefix), bisect_left(array, prefix + "\U0010ffff")
+
+    def _candidates(self, pattern: str) -> Iterable[str]:
+        parts = re.split(r"[%*]", pattern)
+        prefix, suffix = parts[0].split("_")[0], parts[-1].split("_")[-1]
+        ranges = []
+
+        if prefix:
+            start, end = self._prefix_range(self._forward, prefix)
+            ranges.append((end - start, lambda: self._forward[start:end]))
+        if suffix:
+            b_start, b_end = self._prefix_range(self._backward, suffix[::-1])
+            ranges.append((b_end - b_start, lambda: (
+                value[::-1] for value in self._backward[b_start:b_end])))
+        if ranges:
+            return min(ranges, key=lambda item: item[0])[1]()
+
+        fragments = [fragment for part in parts for fragment in part.split("_")
+                     if len(fragment) >= self.NGRAM]
+        if not fragments:
+            return self._forward
+        ngrams = set().union(*(self._split_ngrams(fragment) for fragment in fragments))
+        return set.intersection(*(self._ngrams.get(ngram, set()) for ngram in ngrams))
+
+    def search(self, pattern: str, case_sensitive: bool = False) -> List[int]:
+        """
+        Get ids of items, which values match the pattern
+        Args:
+            pattern: LIKE pattern, '*' is an alias of '%'
+            case_sensitive: LIKE if True, ILIKE otherwise (Default value = False)
+        Returns:
+            List of ids
+        """
+        if not has_wildcards(pattern):
+            items = self._items.get(pattern.lower(), [])
+            return [item_id for value, item_id in items
+                    if not case_sensitive or value == pattern]
+
+        lower_pattern = pattern.lower()
+        regex = like_to_regex(lower_pattern)
+        exact_regex = like_to_regex(pattern, case_sensitive=True) if case_sensitive else None
+        return [item_id for candidate in self._candidates(lower_pattern)
+                if regex.fullmatch(candidate)
+                for value, item_id in self._items[candidate]
+                if exact_regex is None or exact_regex.fullmatch(value)]
+
+
+class SnapshotData:
+    """Immutable set of loaded rows with their indexes
+
+    One instance is built per load and replaces the previous one as a whole,
+    so readers never see a partially loaded snapshot.
+    """
+
+    def __init__(self, db_version: Optional[int]):
+        self.db_version = db_version
+        self.loaded_at = time.monotonic()
+        self.words: Dict[int, SnapshotWord] = {}
+        self.definitions: Dict[int, SnapshotDefinition] = {}
+        self.keys: Dict[int, SnapshotKey] = {}
+        self.authors: Dict[int, SnapshotAuthor] = {}
+        self.types: Dict[int, TypeRecord] = {}
+        self.latest_event_id: Optional[int] = None
+        self.order: Dict[int, int] = {}
+
+        self.names = WildcardIndex()
+        self.key_words = WildcardIndex()
+        self.definitions_by_word: Dict[int, List[int]] = defaultdict(list)
+        self.definitions_by_key: Dict[int, List[int]] = defaultdict(list)
+        self.keys_by_definition: Dict[int, List[int]] = defaultdict(list)
+        self.authors_by_word: Dict[int, List[int]] = defaultdict(list)
+        self.children: Dict[int, List[int]] = defaultdict(list)
+        self.parents: Dict[int, List[int]] = defaultdict(list)
+
+    @classmethod
+    def load(cls) -> SnapshotData:
+        """
+        Load all rows from DB and build indexes
+        """
+        data = cls(BaseSetting.latest_version())
+        session = db.session
+
+        data.latest_event_id = session.query(db.func.max(BaseEvent.id)).scalar()
+        data.types = {row.id: TypeRecord(*row) for row in session.query(
+            BaseType.id, BaseType.type, BaseType.type_x, BaseType.group)}
+        data.authors = {row.id: SnapshotAuthor(*row) for row in session.query(
+            BaseAuthor.id, BaseAuthor.abbreviation, BaseAuthor.full_name, BaseAuthor.notes)}
+
+        words = session.query(
+            BaseWord.id, BaseWord.name, BaseWord.type_id,
+            BaseWord.event_start_id, BaseWord.event_end_id,
+            BaseWord.origin, BaseWord.origin_x, BaseWord.match, BaseWord.rank,
+            BaseWord.year, BaseWord.notes, BaseWord.id_old, BaseWord.TID_old,
+        ).order_by(BaseWord.name, BaseWord.id)
+        for position, row in enumerate(words):
+            word = SnapshotWord(*row)
+            data.words[word.id] = word
+            data.order[word.id] = position
+            data.names.add(word.name, word.id)
+
+        definitions = session.query(
+            BaseDefinition.id, BaseDefinition.word_id, BaseDefinition.position,
+            BaseDefinition.usage, BaseDefinition.grammar_code, BaseDefinition.slots,
+            BaseDefinition.case_tags, BaseDefinition.body, BaseDefinition.language,
+            BaseDefinition.notes,
+        ).order_by(BaseDefinition.word_id, BaseDefinition.position)
+        for row in definitions:
+            definition = SnapshotDefinition(*row)
+            data.definitions[definition.id] = definition
+            data.definitions_by_word[definition.word_id].append(definition.id)
+
+        for row in session.query(BaseKey.id, BaseKey.word, BaseKey.language):
+            key = SnapshotKey(*row)
+            data.keys[key.id] = key
+            data.key_words.add(key.word, key.id)
+
+        for key_id, definition_id in session.query(t_connect_keys.c.KID, t_connect_keys.c.DID):
+            data.definitions_by_key[key_id].append(definition_id)
+            data.keys_by_definition[definition_id].append(key_id)
+
+        for author_id, word_id in session.query(t_connect_authors.c.AID, t_connect_authors.c.WID):
+            data.authors_by_word[word_id].append(author_id)
+
+        for parent_id, child_id in session.query(
+                t_connect_words.c.parent_id, t_connect_words.c.child_id):
+            data.children[parent_id].append(child_id)
+            data.parents[child_id].append(parent_id)
+
+        data.names.build()
+        data.key_words.build()
+        return data
+
+    def sorted_words(self, word_ids) -> List[SnapshotWord]:
+        """
+        Get unique words by their ids in the same order as `ORDER BY name`
+        """
+        return [self.words[word_id] for word_id in sorted(set(word_ids), key=self.order.get)]
+
+
+class DictionarySnapshot:
+    """In-memory read-only snapshot of the dictionary
+
+    The snapshot is loaded on the first request. After that, no more often
+    than once per `check_interval` seconds, it compares the stored
+    `BaseSetting.db_version` with the one in DB and reloads all data
+    if they differ. Set `check_interval` to None to disable automatic checks
+    and use `refresh()` or `reload()` explicitly.
+
+    All methods require an application context.
+    """
+
+    def __init__(self, check_interval: Optional[float] = 60):
+        self.check_interval = check_interval
+        """*Minimal interval between db_version checks in seconds*"""
+        self._data: Optional[SnapshotData] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def data(self) -> SnapshotData:
+        """
+        Current snapshot data, loaded or refreshed if required
+        """
+        data = self._data
+        if data is None:
+            return self.reload()
+        if self.check_interval is not None and \
+                time.monotonic() - self._checked_at >= self.check_interval:
+            return self.refresh()
+        return data
+
+    @property
+    def db_version(self) -> Optional[int]:
+        """
+        db_version of the loaded data or None if nothing is loaded
+        """
+        return self._data.db_version if self._data else None
+
+    def reload(self) -> SnapshotData:
+        """
+        Load all data from DB and replace the current snapshot
+        """
+        with self._lock:
+            started = time.perf_counter()
+            data = SnapshotData.load()
+            self._data, self._checked_at = data, time.monotonic()
+        log.info("Snapshot of db_version %s loaded: %d words, %d definitions, %d keys in %.2fs",
+                 data.db_version, len(data.words), len(data.definitions),
+                 len(data.keys), time.perf_counter() - started)
+        return data
+
+    def refresh(self) -> SnapshotData:
+        """
+        Reload the snapshot only if `BaseSetting.db_version` has changed
+        """
+        data = self._data
+        if data is None or BaseSetting.latest_version() != data.db_version:
+            return self.reload()
+        self._checked_at = time.monotonic()
+        return data
+
+    def clear(self) -> None:
+        """
+        Drop loaded data, it will be loaded again on the next request
+        """
+        with self._lock:
+            self._data = None
+
+    @staticmethod
+    def _event_id(data: SnapshotData, event_id: Union[BaseEvent, int, None]) -> Optional[int]:
+        if not event_id:
+            return data.latest_event_id
+        return event_id.id if isinstance(event_id, BaseEvent) else int(event_id)
+
+    @staticmethod
+    def _is_actual(word: SnapshotWord, event_id: Optional[int]) -> bool:
+        if event_id is None:
+            return False
+        return word.event_start_id <= event_id and (
+            word.event_end_id is None or word.event_end_id > event_id)
+
+    def by_event(self, event_id: Union[BaseEvent, int] = None) -> List[SnapshotWord]:
+        """
+        Words of specified Event (latest by default) ordered by name
+        The same as `AddonWordGetter.by_event(event_id).all()`
+        """
+        data = self.data
+        event_id = self._event_id(data, event_id)
+        return data.sorted_words(
+            word.id for word in data.words.values() if self._is_actual(word, event_id))
+
+    def by_name(
+            self, name: str, event_id: Union[BaseEvent, int] = None,
+            case_sensitive: bool = False) -> List[SnapshotWord]:
+        """
+        Words filtered by name ordered by name
+        The same as `AddonWordGetter.by_name(name, event_id, case_sensitive).all()`
+        """
+        data = self.data
+        event_id = self._event_id(data, event_id)
+        word_ids = data.names.search(name, case_sensitive)
+        return data.sorted_words(
+            word_id for word_id in word_ids if self._is_actual(data.words[word_id], event_id))
+
+    def by_key(
+            self, key: Union[BaseKey, str], language: str = None,
+            event_id: Union[BaseEvent, int] = None,
+            case_sensitive: bool = False) -> List[SnapshotWord]:
+        """
+        Words filtered by key ordered by name
+        The same as `AddonWordGetter.by_key(key, language, event_id, case_sensitive).all()`
+        """
+        data = self.data
+        event_id = self._event_id(data, event_id)
+        key = key.word if isinstance(key, BaseKey) else str(key)
+        key_ids = data.key_words.search(key, case_sensitive)
+        if language:
+            key_ids = [key_id for key_id in key_ids if data.keys[key_id].language == language]
+
+        word_ids = (data.definitions[definition_id].word_id for key_id in key_ids
+                    for definition_id in data.definitions_by_key.get(key_id, ()))
+        return data.sorted_words(
+            word_id for word_id in word_ids if self._is_actual(data.words[word_id], event_id))
+
+    def definitions(self, word_id: int) -> List[SnapshotDefinition]:
+        """
+        Definitions of the word ordered by position
+        """
+        data = self.data
+        return [data.definitions[definition_id]
+                for definition_id in data.definitions_by_word.get(word_id, [])]
+
+    def keys(self, definition_id: int) -> List[SnapshotKey]:
+        """
+        Keys of the definition
+        """
+        data = self.data
+        return [data.keys[key_id] for key_id in data.keys_by_definition.get(definition_id, [])]
+
+    def authors(self, word_id: int) -> List[SnapshotAuthor]:
+        """
+        Authors of the word
+        """
+        data = self.data
+        return [data.authors[author_id] for author_id in data.authors_by_word.get(word_id, [])]
+
+    def type(self, word_id: int) -> Optional[TypeRecord]:
+        """
+        Type of the word
+        """
+        data = self.data
+        word = data.words.get(word_id)
+        return data.types.get(word.type_id) if word else None
+
+    def derivatives(self, word_id: int) -> List[SnapshotWord]:
+        """
+        Children of the word ordered by name
+        """
+        data = self.data
+        return data.sorted_words(data.children.get(word_id, []))
+
+    def parents(self, word_id: int) -> List[SnapshotWord]:
+        """
+        Parents of the word ordered by name
+        """
+        data = self.data
+        return data.sorted_words(data.parents.get(word_id, []))
+
+    def info(self) -> Dict[str, Union[int, float, None]]:
+        """
+        Get the snapshot statistics
+        """
+        data = self._data
+        if data is None:
+            return {"db_version": None, "words": 0, "definitions": 0, "keys": 0, }
+        return {"db_version": data.db_version, "words": len(data.words),
+                "definitions": len(data.definitions), "keys": len(data.keys),
+                "age": time.monotonic() - data.loaded_at, }
+
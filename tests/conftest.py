@@ -2,6 +2,7 @@
 """Defines fixtures available to all tests."""
 
 import logging
+from types import SimpleNamespace
 
 import pytest
 
@@ -33,3 +34,22 @@ def db(app):
     # Explicitly close DB connection
     _db.session.close()
     _db.drop_all()
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    """Create database in a file, so it is available for other processes.
+    Returns the config of the database, which is picklable for worker processes"""
+    config = SimpleNamespace(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'lod.db'}",
+        SQLALCHEMY_TRACK_MODIFICATIONS=False, )
+    _app = create_app(config, _db)
+    ctx = _app.app_context()
+    ctx.push()
+    _db.create_all()
+
+    yield config
+
+    _db.session.close()
+    _db.drop_all()
+    ctx.pop()
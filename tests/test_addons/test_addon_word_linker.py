@@ -76,3 +76,21 @@ class TestWord:
 
         assert word.authors.count() == 2
         assert isinstance(word.authors[0], Author)
+
+    def test_link_derivatives(self):
+        db_add_objects(Word, words)
+        pairs = [(word_2["id"], word_1["id"]), (word_3["id"], word_1["id"])]
+
+        assert Word.link_derivatives(pairs[:1]) == 1
+        assert Word.link_derivatives(pairs + pairs) == 1
+        assert Word.link_derivatives(pairs) == 0
+        assert Word.get_by_id(word_1["id"])._parents.count() == 2
+
+    def test_link_authors(self):
+        db_add_objects(Word, words)
+        db_add_objects(Author, authors)
+        pairs = [(author["id"], 7316) for author in authors]
+
+        assert Word.link_authors(pairs) == len(authors)
+        assert Word.link_authors(pairs) == 0
+        assert Word.get_by_id(7316).authors.count() == len(authors)
@@ -3,13 +3,16 @@
 """Base Model unit tests."""
 import pytest
 
+from loglan_db import db
+from loglan_db.model_db.base_connect_tables import t_connect_words
+
 from loglan_db.model_db.base_type import BaseType as Type
 from loglan_db.model_db.base_word import BaseWord
 from loglan_db.model_db.addons.addon_word_sourcer import AddonWordSourcer
 from loglan_db.model_db.base_word_source import BaseWordSource as WordSource
 from tests.data import littles, little_types
 from tests.data import words, types, prim_words, prim_types, other_word_2
-from tests.functions import db_add_objects
+from tests.functions import db_add_objects, db_connect_words
 
 
 class Word(BaseWord, AddonWordSourcer):
@@ -118,3 +121,38 @@ class TestWord:
         afx = Word.get_by_id(3802)
         result = afx.get_sources_cpd()
         assert result == []
+
+    def test_derivative_edges(self):
+        db_add_objects(Word, words + littles)
+        db_add_objects(Type, types + little_types)
+
+        expected = {
+            (parent.id, word.id) for word in Word.get_all()
+            for parent in word.get_sources_cpx() + word.get_sources_cpd()}
+        assert expected
+        assert Word.derivative_edges() == expected
+
+    def test_build_derivative_graph(self):
+        db_add_objects(Word, words + littles)
+        db_add_objects(Type, types + little_types)
+        edges = Word.derivative_edges()
+        kept, wrong = (7316, 3813), (3802, 7316)
+        db_connect_words([sorted(edges)[0], kept, wrong])
+
+        result = Word.build_derivative_graph()
+        assert result == {"added": len(edges) - 1, "removed": 1}
+
+        existing = set(db.session.query(t_connect_words))
+        assert existing == edges | {kept}
+        assert Word.build_derivative_graph() == {"added": 0, "removed": 0}
+
+    def test_build_derivative_graph_keeps_links_without_origin(self):
+        db_add_objects(Word, words + littles)
+        db_add_objects(Type, types + little_types)
+        db.session.execute(BaseWord.__table__.update().where(BaseWord.id == 7316).values(origin=""))
+        manual = (3802, 7316)
+        db_connect_words([manual])
+
+        Word.build_derivative_graph()
+        assert manual in set(db.session.query(t_connect_words))
+        assert all(child_id != 7316 for _, child_id in Word.derivative_edges())
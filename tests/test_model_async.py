@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903, C0116
+
+"""Async facade unit tests."""
+
+import asyncio
+
+import pytest
+
+from loglan_db.model import Type, Author, Event
+from loglan_db.model_html.html_definition import HTMLExportDefinition as Definition
+from loglan_db.model_html.html_word import HTMLExportWord
+from loglan_db.model_async import AsyncDictionary, AsyncKey
+from tests.data import definitions, words, types, authors, all_events
+from tests.data import connect_authors, connect_words, keys, connect_keys
+from tests.data import changed_words, changed_definitions, changed_keys, connect_changed_keys
+from tests.functions import db_add_objects, db_connect_authors, db_connect_words, db_connect_keys
+
+pytest.importorskip("aiosqlite")
+
+
+def ids(result):
+    return [item.id for item in result]
+
+
+async def gather(*coroutines):
+    return await asyncio.gather(*coroutines)
+
+
+@pytest.fixture
+def dictionary(file_db):
+    url = file_db.SQLALCHEMY_DATABASE_URI.replace("sqlite://", "sqlite+aiosqlite://", 1)
+    result = AsyncDictionary(url)
+    yield result
+    asyncio.run(result.close())
+
+
+class TestAsyncDictionary:
+    """AsyncDictionary tests."""
+
+    @pytest.fixture
+    def filled(self, file_db):  # pylint: disable=W0613
+        db_add_objects(HTMLExportWord, words)
+        db_add_objects(Type, types)
+        db_add_objects(Author, authors)
+        db_add_objects(AsyncKey, keys)
+        db_add_objects(Definition, definitions)
+        db_add_objects(Event, all_events)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+        db_connect_keys(connect_keys)
+
+    @pytest.mark.usefixtures("filled")
+    def test_words(self, dictionary):  # pylint: disable=W0621
+        by_name, by_name_event, by_key, by_key_es = asyncio.run(gather(
+            dictionary.by_name("PRU*"), dictionary.by_name("pru*", event_id=1),
+            dictionary.by_key("test"), dictionary.by_key("test", language="es")))
+
+        assert ids(by_name) == ids(HTMLExportWord.by_name("PRU*").all())
+        assert ids(by_name_event) == ids(HTMLExportWord.by_name("pru*", event_id=1).all())
+        assert ids(by_key) == ids(HTMLExportWord.by_key("test").all())
+        assert ids(by_key_es) == ids(HTMLExportWord.by_key("test", language="es").all())
+        assert by_name
+
+    @pytest.mark.usefixtures("filled")
+    def test_html(self, dictionary):  # pylint: disable=W0621
+        for style in ("normal", "ultra"):
+            words_html, translation, nothing = asyncio.run(gather(
+                dictionary.html_all_by_name("pru*", style=style),
+                dictionary.translation_by_key("test", style=style),
+                dictionary.translation_by_key("word_that_does_not_exist")))
+
+            assert words_html == HTMLExportWord.html_all_by_name("pru*", style=style)
+            assert translation == HTMLExportWord.translation_by_key("test", style=style)
+            assert nothing is None
+        assert asyncio.run(dictionary.html_all_by_name("word_that_does_not_exist")) is None
+
+    def test_keys_by_event(self, dictionary):  # pylint: disable=W0621
+        db_add_objects(HTMLExportWord, changed_words)
+        db_add_objects(Event, all_events)
+        db_add_objects(AsyncKey, changed_keys)
+        db_add_objects(Definition, changed_definitions)
+        db_connect_keys(connect_changed_keys)
+
+        result_1, result_2 = asyncio.run(gather(
+            dictionary.keys_by_event(1), dictionary.keys_by_event()))
+        assert sorted(ids(result_1)) == [5926, 8824]
+        assert sorted(ids(result_2)) == [620, 1421]
+        assert asyncio.run(dictionary.latest_event_id()) == Event.latest_id()
@@ -4,6 +4,8 @@
 
 import pytest
 
+from loglan_db import db
+
 from loglan_db.model_db.base_definition import BaseDefinition as Definition
 from loglan_db.model_db.base_key import BaseKey as Key
 from tests.data import connect_keys
@@ -59,6 +61,36 @@ class TestDefinition:
         assert d.keys.count() == 2
         assert sorted([k.word for k in d.keys]) == sorted(keys_to_add)
 
+    def test_link_keys_from_list_of_str_create_missing(self):
+        db_add_objects(Definition, definitions)
+        db_add_objects(Key, keys)
+        keys_count = Key.query.count()
+
+        keys_to_add = ["test", "trial", "trial", "assay"]
+        d = Definition.get_by_id(13527)
+        assert d.link_keys_from_list_of_str(keys_to_add) != []
+        assert d.keys.count() == 1
+
+        linked = d.link_keys_from_list_of_str(keys_to_add, create_missing=True)
+        assert sorted(k.word for k in linked) == ["assay", "trial"]
+        assert sorted(k.word for k in d.keys) == ["assay", "test", "trial"]
+        assert Key.query.count() == keys_count + 2
+
+        assert d.link_keys_from_list_of_str(keys_to_add, create_missing=True) == []
+        assert Key.query.count() == keys_count + 2
+
+    def test_link_keys_from_list_of_str_pending(self):
+        db_add_objects(Definition, definitions)
+        db_add_objects(Key, keys)
+        d = Definition.get_by_id(13527)
+
+        with db.session.no_autoflush:
+            linked = d.link_keys_from_list_of_str(["test", "trial"], create_missing=True)
+            assert sorted(k.word for k in linked) == ["test", "trial"]
+            assert d.link_keys_from_list_of_str(["test", "trial"], create_missing=True) == []
+        db.session.commit()
+        assert sorted(k.word for k in d.keys) == ["test", "trial"]
+
     def test_link_key_from_str(self):
         db_add_objects(Key, keys)
         d = dar(Definition, definition_2)
@@ -134,3 +166,33 @@ class TestDefinition:
 
         result = Definition.by_key("test", language="es").all()
         assert len(result) == 0
+
+    def test_sync_keys_on_body_change(self):
+        db_add_objects(Definition, definitions)
+        db_add_objects(Key, keys)
+        d = Definition.get_by_id(13527)
+        d.link_keys_from_definition_body()
+        d.link_key_from_str("tester")
+        db.session.commit()
+        assert sorted(k.word for k in d.keys) == ["examine", "test", "tester"]
+
+        d.update({"body": d.body.replace("«examine»", "«probe»")})
+        assert sorted(k.word for k in d.keys) == ["probe", "test", "tester"]
+        assert Key.query.filter(Key.word == "examine").count() == 1
+
+        d.update({"notes": "no keys changes"})
+        assert sorted(k.word for k in d.keys) == ["probe", "test", "tester"]
+
+    def test_sync_keys_disabled(self):
+        db_add_objects(Definition, definitions)
+        db_add_objects(Key, keys)
+        d = Definition.get_by_id(13527)
+        d.link_keys_from_definition_body()
+        db.session.commit()
+
+        Definition.sync_keys = False
+        try:
+            d.update({"body": d.body.replace("«examine»", "«probe»")})
+        finally:
+            Definition.sync_keys = True
+        assert sorted(k.word for k in d.keys) == ["examine", "test"]
@@ -6,7 +6,8 @@ import datetime
 
 import pytest
 
-from loglan_db.model_db.base_event import BaseEvent as Event
+from loglan_db import db
+from loglan_db.model_db.base_event import BaseEvent as Event, LatestEventCache
 from loglan_db.model_db.base_word import BaseWord as Word
 from tests.data import changed_words, changed_events, all_events
 from tests.functions import db_add_objects, dar
@@ -54,3 +55,61 @@ class TestEvent:
 
         assert latest.id == 6
         assert latest.annotation == 'Torrua Repair'
+
+    def test_latest_cache(self):
+        db_add_objects(Event, all_events[:3])
+        Event.latest_cache.invalidate()
+        misses = Event.latest_cache.misses
+        hits = Event.latest_cache.hits
+
+        assert Event.latest_id() == 3
+        assert Event.latest_id() == 3
+        assert Event.latest().id == 3
+        assert Event.latest_cache.misses == misses + 1
+        assert Event.latest_cache.hits == hits + 2
+
+        db_add_objects(Event, all_events[3:])
+        assert Event.latest_id() == 6
+        assert Event.latest_cache.misses == misses + 2
+
+        Event.get_by_id(6).delete()
+        assert Event.latest_id() == 5
+        assert Event.latest_cache.info()["value"] == 5
+
+    def test_latest_cache_transaction(self):
+        db_add_objects(Event, all_events[:3])
+        assert Event.latest_id() == 3
+
+        db.session.add(Event(**all_events[3]))
+        db.session.flush()
+        assert Event.latest_cache.info()["value"] == 3
+        db.session.commit()
+        assert Event.latest_cache.info()["value"] is None
+        assert Event.latest_id() == 4
+
+    def test_latest_cache_generation(self):
+        cache = LatestEventCache()
+
+        def loader():
+            cache.invalidate()
+            return 3
+
+        assert cache.get(loader) == 3
+        assert cache.info()["value"] is None
+        assert cache.get(lambda: 4) == 4
+        assert cache.info()["value"] == 4
+
+    def test_latest_cache_ttl(self):
+        db_add_objects(Event, all_events)
+        Event.latest_cache.ttl = 0
+        try:
+            misses = Event.latest_cache.misses
+            assert Event.latest_id() == 6
+            assert Event.latest_id() == 6
+            assert Event.latest_cache.misses == misses + 2
+        finally:
+            Event.latest_cache.ttl = None
+
+    def test_latest_without_events(self):
+        assert Event.latest_id() is None
+        assert Event.latest() is None
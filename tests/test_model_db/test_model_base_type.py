@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
-# pylint: disable=R0201, R0903, C0116, C0103
+# pylint: disable=R0201, R0903, C0116, C0103, W0212
 """Base Model unit tests."""
 
 import pytest
+from sqlalchemy import event
 
+from loglan_db import db
 from loglan_db.model_db.base_type import BaseType as Type
 from loglan_db.model_db.base_word import BaseWord as Word
 from tests.data import words, types
@@ -55,3 +57,66 @@ class TestType:
 
         test_type = Type.by("Cpx").first()
         assert len(test_type.words) == 1
+
+    def test_registry(self):
+        db_add_objects(Type, types)
+
+        assert Type.registry.ids("Predicate") == [5, 9]
+        assert Type.registry.ids(["Afx", "Cpx"]) == [2, 5]
+        assert Type.registry.ids("Unknown") == []
+        assert Type.registry.ids_matching(word_type_x="Predicate", word_group="Prim") == [9]
+        assert Type.registry.ids_matching() == [2, 5, 9]
+        assert Type.registry.get(2).type == "Afx"
+
+        Type.get_by_id(2).update({"group": "Cpx"})
+        assert Type.registry.ids("Cpx") == [2, 5]
+
+        Type.get_by_id(5).delete()
+        assert Type.registry.ids("Cpx") == [2]
+        assert Type.registry.get(5) is None
+
+    def test_registry_transaction(self):
+        db_add_objects(Type, types)
+        assert Type.registry.ids("Cpx") == [5]
+
+        Type.get_by_id(2).group = "Cpx"
+        db.session.flush()
+        Type.registry.invalidate()
+        assert Type.registry.ids("Cpx") == [2, 5]
+        db.session.rollback()
+        assert Type.registry.ids("Cpx") == [5]
+
+        Type.get_by_id(2).group = "Cpx"
+        db.session.commit()
+        assert Type.registry.ids("Cpx") == [2, 5]
+
+    def test_registry_generation(self):
+        db_add_objects(Type, types)
+        Type.registry.invalidate()
+
+        calls = []
+
+        def invalidating_execute(*_):
+            if not calls:
+                Type.registry.invalidate()
+            calls.append(1)
+
+        event.listen(db.engine, "before_cursor_execute", invalidating_execute)
+        try:
+            assert Type.registry.ids("Cpx") == [5]
+            assert Type.registry._records is None
+            assert Type.registry.ids("Cpx") == [5]
+            assert Type.registry._records is not None
+        finally:
+            event.remove(db.engine, "before_cursor_execute", invalidating_execute)
+
+    def test_registry_ttl(self):
+        db_add_objects(Type, types)
+        assert Type.registry.ids("Cpx") == [5]
+        db.session.execute(Type.__table__.update().where(Type.id == 2).values(group="Cpx"))
+
+        Type.registry.ttl = 0
+        try:
+            assert Type.registry.ids("Cpx") == [2, 5]
+        finally:
+            Type.registry.ttl = None
@@ -8,10 +8,11 @@ import pytest
 from loglan_db.model_export import ExportAuthor as Author, ExportEvent as Event, \
     ExportSyllable as Syllable, ExportSetting as Setting, ExportType as Type, \
     ExportWord as Word, ExportDefinition as Definition, ExportWordSpell as WordSpell
+from loglan_db.model_export import export_models_pg, export_to_files, export_to_files_parallel
 from tests.data import author_1, other_author_1, event_1, syllable_35, \
     setting_1, type_1, word_1, other_word_1, word_2
 from tests.data import connect_authors, connect_words
-from tests.data import definitions, words, types, authors
+from tests.data import definitions, words, types, authors, events, settings, syllables
 from tests.functions import db_add_and_return, db_add_objects, db_add_object, \
     db_connect_authors, db_connect_words
 
@@ -90,6 +91,25 @@ class TestWord:
         assert result == "3880@C-Prim@Predicate@kak kao@56%@L4@1975@1.0@3/3R akt " \
                          "| 4/4S acto | 3/3F acte | 2/3E act | 2/3H kam@@prukao@"
 
+    def test_export_bulk(self):
+        """Test Word.export_bulk() method"""
+        db_add_objects(Word, words)
+        db_add_objects(Author, authors)
+        db_add_objects(Type, types)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+
+        result = Word.export_bulk()
+        assert result == [word.export() for word in Word.query.order_by(Word.id).all()]
+
+        selected_words = [Word.get_by_id(3813), Word.get_by_id(3911)]
+        result = Word.export_bulk(selected_words)
+        assert result == [word.export() for word in selected_words]
+        assert result[0] == "3880@C-Prim@Predicate@kak kao@56%@L4@1975@1.0@3/3R akt " \
+                            "| 4/4S acto | 3/3F acte | 2/3E act | 2/3H kam@@prukao@"
+
+        assert Word.export_bulk([]) == []
+
     def test_e_affixes(self):
         """Test affix conversion"""
         db_add_objects(Word, words)
@@ -173,3 +193,86 @@ class TestWordSpell:
 
         result = obj.export()
         assert result == "7191@prukao@prukao@555555@1@9999@"
+
+
+@pytest.mark.usefixtures("db")
+class TestExportToFiles:
+    """Streaming export tests."""
+    def test_export_stream(self):
+        """Test export_stream() yields the same strings as export()"""
+        db_add_objects(Word, words)
+        db_add_objects(Author, authors)
+        db_add_objects(Type, types)
+        db_add_objects(Definition, definitions)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+
+        for model in (Word, Definition, WordSpell):
+            expected = [obj.export() for obj in model.query.order_by(model.id).all()]
+            assert list(model.export_stream(batch_size=4)) == expected
+
+    def test_export_to_files(self, tmp_path):
+        """Test exporting all tables to text files"""
+        db_add_objects(Word, words)
+        db_add_objects(Author, authors)
+        db_add_objects(Type, types)
+        db_add_objects(Event, events)
+        db_add_objects(Setting, settings)
+        db_add_objects(Syllable, syllables)
+        db_add_objects(Definition, definitions)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+
+        result = export_to_files(str(tmp_path), batch_size=5)
+
+        assert len(result) == len(export_models_pg)
+        for model in export_models_pg:
+            stat = result[model.__tablename__]
+            lines = (tmp_path / f"{model.__tablename__}.txt") \
+                .read_text(encoding="utf-8").splitlines()
+            assert lines == [obj.export() for obj in model.query.order_by(model.id).all()]
+            assert stat.rows == len(lines)
+            assert stat.rate >= 0
+            assert stat.worker_seconds == stat.seconds
+
+
+class TestExportToFilesParallel:
+    """Parallel export tests."""
+    def test_export_shards(self, file_db):
+        """Test splitting table into id ranges"""
+        db_add_objects(Word, words)
+
+        assert Type.export_shards(4) == [None, ]
+        assert Word.export_shards(1) == [None, ]
+
+        result = Word.export_shards(2)
+        assert result == [(3802, 5560), (5560, 7318)]
+
+    def test_export_to_files_parallel(self, file_db, tmp_path):
+        """Test exporting all tables with a process pool"""
+        db_add_objects(Word, words)
+        db_add_objects(Author, authors)
+        db_add_objects(Type, types)
+        db_add_objects(Event, events)
+        db_add_objects(Setting, settings)
+        db_add_objects(Syllable, syllables)
+        db_add_objects(Definition, definitions)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+
+        result = export_to_files_parallel(
+            str(tmp_path / "parallel"), config=file_db, shards=3, processes=2)
+        export_to_files(str(tmp_path / "serial"))
+
+        assert len(result) == len(export_models_pg)
+        for model in export_models_pg:
+            file_name = f"{model.__tablename__}.txt"
+            parallel = (tmp_path / "parallel" / file_name).read_text(encoding="utf-8")
+            serial = (tmp_path / "serial" / file_name).read_text(encoding="utf-8")
+            assert parallel == serial
+            stat = result[model.__tablename__]
+            assert stat.rows == len(serial.splitlines())
+            assert stat.seconds >= 0 and stat.worker_seconds >= 0
+
+        assert sorted(path.name for path in (tmp_path / "parallel").iterdir()) == \
+            sorted(f"{model.__tablename__}.txt" for model in export_models_pg)
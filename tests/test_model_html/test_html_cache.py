@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903, C0116
+
+"""HTML result cache unit tests."""
+
+import pytest
+
+from loglan_db.model import Type, Author, Key, Event, Setting
+from loglan_db.model_html.html_cache import HTMLResultCache, MemoryBackend, \
+    SQLiteBackend, MISSING, set_result_cache, get_result_cache
+from loglan_db.model_html.html_word import HTMLExportWord
+from loglan_db.model_html.html_definition import HTMLExportDefinition as Definition
+from tests.data import definitions, words, types, authors, all_events, settings
+from tests.data import connect_authors, connect_words, keys, connect_keys
+from tests.functions import db_add_objects, db_connect_authors, db_connect_words, db_connect_keys
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryBackend(maxsize=2)
+    return SQLiteBackend(str(tmp_path / "cache.sqlite"), maxsize=2)
+
+
+def test_backend_lru(backend):
+    backend.set("b", None)
+    assert backend.get("b") is None
+    backend.set("a", "A")
+    assert backend.get("a") == "A"
+    assert backend.get("c") is MISSING
+
+    backend.set("c", "C")
+    assert backend.get("b") is MISSING
+    assert backend.get("a") == "A"
+    assert len(backend) == 2
+
+    backend.clear()
+    assert len(backend) == 0
+
+
+def test_sqlite_backend_is_shared(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    SQLiteBackend(path).set("key", "value")
+    assert SQLiteBackend(path).get("key") == "value"
+
+
+@pytest.mark.usefixtures("db")
+class TestHTMLResultCache:
+    """HTMLResultCache tests."""
+
+    @pytest.fixture(autouse=True)
+    def cache(self, db):  # pylint: disable=W0613, W0621
+        db_add_objects(HTMLExportWord, words)
+        db_add_objects(Type, types)
+        db_add_objects(Author, authors)
+        db_add_objects(Key, keys)
+        db_add_objects(Definition, definitions)
+        db_add_objects(Event, all_events)
+        db_add_objects(Setting, settings)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+        db_connect_keys(connect_keys)
+
+        cache = HTMLResultCache(check_interval=0)
+        set_result_cache(cache)
+        yield cache
+        set_result_cache(None)
+
+    def test_hits(self, cache):
+        assert get_result_cache() is cache
+        expected = HTMLExportWord.html_all_by_name("pruci", style="normal")
+        assert HTMLExportWord.html_all_by_name("pruci", "normal", prefetch=False) == expected
+        assert HTMLExportWord.html_all_by_name("pruci", event_id=6, style="normal") == expected
+        assert HTMLExportWord.html_all_by_name("pruci", style="ultra") != expected
+        assert HTMLExportWord.html_all_by_name("buuku") is None
+        assert HTMLExportWord.html_all_by_name("buuku") is None
+
+        expected = HTMLExportWord.translation_by_key("test")
+        assert HTMLExportWord.translation_by_key("test", style="ultra") == expected
+
+        assert cache.info()["hits"] == 4
+        assert cache.info()["misses"] == 4
+        assert cache.hit_rate == 0.5
+
+    def test_invalidation(self, cache):
+        HTMLExportWord.html_all_by_name("pruci")
+        word = HTMLExportWord.get_by_id(7315)
+        word.update({"origin": "new origin"})
+        assert "new origin" not in HTMLExportWord.html_all_by_name("pruci")
+
+        setting = Setting.get_by_id(settings[0]["id"])
+        setting.update({"last_word_id": setting.last_word_id + 1})
+        assert "new origin" in HTMLExportWord.html_all_by_name("pruci")
+        assert cache.info()["size"] == 1
+        assert cache.misses == 2
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903, C0116
+
+"""Static HTML dictionary unit tests."""
+
+import pytest
+
+from loglan_db.model import Type, Author, Event, Key
+from loglan_db.model_html.html_definition import HTMLExportDefinition as Definition
+from loglan_db.model_html.html_dictionary import dictionary_letters, export_dictionary_html, \
+    iter_key_translations, export_keys_html
+from loglan_db.model_html.html_word import HTMLExportWord
+from tests.data import definitions, words, types, authors, all_events
+from tests.data import connect_authors, connect_words, keys, connect_keys
+from tests.functions import db_add_objects, db_connect_authors, db_connect_words, db_connect_keys
+
+
+@pytest.fixture(autouse=True)
+def fill(file_db):  # pylint: disable=W0613
+    db_add_objects(HTMLExportWord, words)
+    db_add_objects(Type, types)
+    db_add_objects(Author, authors)
+    db_add_objects(Event, all_events)
+    db_add_objects(Definition, definitions)
+    db_add_objects(Key, keys)
+    db_connect_keys(connect_keys)
+    db_connect_authors(connect_authors)
+    db_connect_words(connect_words)
+
+
+class TestExportDictionaryHTML:
+    """Static HTML dictionary tests."""
+
+    def test_dictionary_letters(self, file_db):  # pylint: disable=W0613, W0621
+        expected = sorted({item["name"][0].lower() for item in words})
+        assert dictionary_letters(Event.latest_id()) == expected
+
+    @pytest.mark.parametrize("processes", [1, 2])
+    def test_export_dictionary_html(self, file_db, tmp_path, processes):  # pylint: disable=W0621
+        paths = export_dictionary_html(
+            str(tmp_path / "html"), style="normal", event_id=1,
+            config=file_db, processes=processes)
+
+        suffix = Event.get_by_id(1).suffix
+        assert sorted(paths) == dictionary_letters(1)
+        for letter, path in paths.items():
+            assert path.endswith(f"{letter}_{suffix}.html")
+            with open(path, encoding="utf-8") as file:
+                assert file.read() == HTMLExportWord.html_all_by_name(
+                    f"{letter}*", style="normal", event_id=1)
+
+    @pytest.mark.parametrize("style", ["normal", "ultra"])
+    def test_iter_key_translations(self, file_db, style):  # pylint: disable=W0613, W0621
+        result = list(iter_key_translations(style=style, event_id=1))
+        assert [(key, language) for key, language, _ in result] == sorted(
+            {(key["word"].lower(), key["language"]) for key in keys},
+            key=lambda item: (item[1], item[0]))
+        for key, language, html in result:
+            assert html == HTMLExportWord.translation_by_key(
+                key, language=language, style=style, event_id=1)
+
+    def test_export_keys_html(self, file_db, tmp_path):  # pylint: disable=W0613, W0621
+        paths = export_keys_html(str(tmp_path / "keys"), language="en", style="ultra")
+
+        result = list(iter_key_translations(language="en", style="ultra"))
+        suffix = Event.latest().suffix
+        assert sorted(paths) == sorted({f"en_{key[0]}" for key, _, _ in result})
+        for shard, path in paths.items():
+            assert path.endswith(f"{shard}_{suffix}.html")
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+            assert content.startswith("<ks>\n") and content.endswith("\n</ks>\n")
+            for key, _, html in result:
+                assert (f'<kw kid="{key}"><kl>{key}</kl>\n<ts>\n{html}\n</ts>\n</kw>' in content) \
+                       is (shard == f"en_{key[0]}")
+
+    def test_export_keys_html_escaping(self, file_db, tmp_path):  # pylint: disable=W0613, W0621
+        db_add_objects(Key, [
+            {"id": 1, "word": 'r&d "x"', "language": "en"},
+            {"id": 2, "word": "(be", "language": "en"}, ])
+        db_connect_keys([(1, 13527), (2, 13527)])
+        paths = export_keys_html(str(tmp_path / "keys"), language="en", style="normal")
+
+        with open(paths["en_r"], encoding="utf-8") as file:
+            content = file.read()
+        assert '<div class="key" kid="r&amp;d &quot;x&quot;">' in content
+        assert '<span class="key_name">r&amp;d &quot;x&quot;</span>' in content
+        assert 'r&d "x"' not in content
+        assert "en__" in paths
+
+    def test_export_wildcard_letter(self, file_db, tmp_path):  # pylint: disable=W0621
+        db_add_objects(HTMLExportWord, [{
+            **words[0], "id": 1, "name": "_prukao", "id_old": 1, "event_start_id": 1, }])
+        paths = export_dictionary_html(
+            str(tmp_path / "html"), style="normal", event_id=1, config=file_db, processes=1)
+
+        with open(paths["_"], encoding="utf-8") as file:
+            content = file.read()
+        assert "_prukao" in content
+        assert content.count('<div class="word" ') == 1
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903, C0116
+
+"""HTML materialized meanings unit tests."""
+
+import pytest
+from sqlalchemy import event
+
+from loglan_db import db as database
+from loglan_db.model import Type, Author, Event
+from loglan_db.model_db.base_connect_tables import t_connect_authors, t_connect_words, \
+    mark_words_changed
+from loglan_db.model_db.base_word import BaseWord
+from loglan_db.model_db.addons.addon_word_linker import AddonWordLinker
+from loglan_db.model_db.addons.addon_word_sourcer import AddonWordSourcer
+from loglan_db.model_html.html_definition import HTMLExportDefinition as Definition
+from loglan_db.model_html.html_meaning import HTMLWordMeaning
+from loglan_db.model_html.html_word import HTMLExportWord
+from tests.data import definitions, words, types, authors, events, connect_authors, connect_words
+from tests.functions import db_add_objects, db_connect_authors, db_connect_words
+
+
+class Word(BaseWord, AddonWordLinker, AddonWordSourcer):
+    """BaseWord class with Linker and Sourcer addons"""
+
+
+def render():
+    return {style: HTMLExportWord.html_all_by_name("pru*", style=style)
+            for style in HTMLWordMeaning.STYLES}
+
+
+def assert_consistent():
+    stored = render()
+    HTMLWordMeaning.disable()
+    try:
+        assert stored == render()
+    finally:
+        HTMLWordMeaning.enable()
+    return stored
+
+
+@pytest.mark.usefixtures("db")
+class TestHTMLWordMeaning:
+    """HTMLWordMeaning tests."""
+
+    @pytest.fixture(autouse=True)
+    def fill(self, db):  # pylint: disable=W0613, W0621
+        db_add_objects(HTMLExportWord, words)
+        db_add_objects(Type, types)
+        db_add_objects(Author, authors)
+        db_add_objects(Event, events)
+        db_add_objects(Definition, definitions)
+        db_connect_authors(connect_authors)
+        db_connect_words([pair for pair in connect_words if pair != (7315, 7316)])
+        yield
+        HTMLWordMeaning.disable()
+
+    def test_rebuild(self):
+        expected = render()
+        HTMLWordMeaning.enable()
+        assert HTMLWordMeaning.rebuild() == len(words)
+        assert HTMLWordMeaning.query.count() == len(words) * len(HTMLWordMeaning.STYLES)
+        assert render() == expected
+
+        meanings = HTMLWordMeaning.get_many([7316, 1], "normal")
+        assert list(meanings) == [7316]
+        assert meanings[7316].definitions
+
+    def test_single_query(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(database.engine, "before_cursor_execute", listener)
+        try:
+            render()
+        finally:
+            event.remove(database.engine, "before_cursor_execute", listener)
+        # the latest event once, then words and their meanings per style
+        assert len(statements) <= 1 + 2 * len(HTMLWordMeaning.STYLES)
+
+    def test_rebuild_on_definition_change(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        Definition.get_by_id(13527).update({"body": "K «prove» B for P with test V."})
+        assert "<k>prove</k>" in assert_consistent()["normal"]
+
+    def test_rebuild_on_author_change(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        Author.get_by_id(13).update({"abbreviation": "JCB2"})
+        assert "JCB2" in assert_consistent()["normal"]
+
+    def test_rebuild_on_type_change(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        Type.get_by_id(9).update({"type": "X-Prim"})
+        assert "X-Prim" in assert_consistent()["normal"]
+
+    def test_rebuild_on_marked_core_links(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        database.session.execute(t_connect_words.insert().values(parent_id=7315, child_id=7316))
+        mark_words_changed([7315, 7316])
+        database.session.commit()
+        assert "prukao" in assert_consistent()["normal"].split("pruci", 2)[-1]
+
+    def test_rebuild_on_add_child(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        Word.get_by_id(7315).add_child(Word.get_by_id(7316))
+        database.session.commit()
+        assert "prukao" in assert_consistent()["normal"].split("pruci", 2)[-1]
+
+    def test_rebuild_on_add_author(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        before = render()
+        Word.get_by_id(7314).add_author(Author.get_by_id(29))
+        database.session.commit()
+        assert assert_consistent() != before
+
+    def test_rebuild_on_derivative_graph(self):
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        assert Word.build_derivative_graph()["added"] > 0
+        assert "prukao" in assert_consistent()["normal"].split("pruci", 2)[-1]
+
+    def test_disabled(self):
+        HTMLWordMeaning.rebuild([7316])
+        Definition.get_by_id(13527).update({"body": "K «prove» B for P with test V."})
+        assert HTMLWordMeaning.get_many([7316], "normal")[7316].definitions[0].find("prove") == -1
+        assert "<k>prove</k>" in render()["normal"]
+
+    def test_moved_definition_and_deleted_word(self):
+        Word.get_by_id(7315).add_child(Word.get_by_id(7316))
+        database.session.commit()
+        HTMLWordMeaning.enable()
+        HTMLWordMeaning.rebuild()
+
+        Definition.get_by_id(13527).update({"word_id": 7315})
+        stored = render()
+        HTMLWordMeaning.disable()
+        assert stored == render()
+
+        HTMLWordMeaning.enable()
+        for definition in Definition.query.filter(Definition.word_id == 7316):
+            database.session.delete(definition)
+        database.session.execute(t_connect_authors.delete().where(t_connect_authors.c.WID == 7316))
+        database.session.delete(HTMLExportWord.get_by_id(7316))
+        database.session.commit()
+        stored = render()
+        HTMLWordMeaning.disable()
+        assert stored == render()
+        assert "prukao" not in stored["normal"]
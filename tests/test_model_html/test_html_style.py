@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903, C0116
+
+"""HTML style registry unit tests."""
+
+import pytest
+
+from loglan_db.model import Type, Author, Key, Event
+from loglan_db.model_html.html_definition import HTMLExportDefinition as Definition
+from loglan_db.model_html.html_style import HTML_STYLES, get_style, register_style
+from loglan_db.model_html.html_word import HTMLExportWord
+from tests.data import definitions, words, types, authors, all_events
+from tests.data import connect_authors, connect_words, keys, connect_keys
+from tests.functions import db_add_objects, db_connect_authors, db_connect_words, db_connect_keys
+
+
+@pytest.fixture
+def custom_style():
+    style = register_style(get_style("normal")._replace(name="custom", complex="<b>%s</b>"))
+    yield style
+    HTML_STYLES.pop(style.name)
+
+
+def test_unknown_style():
+    with pytest.raises(KeyError):
+        get_style("unknown")
+
+
+@pytest.mark.usefixtures("db")
+def test_registered_style(custom_style):  # pylint: disable=W0621
+    db_add_objects(HTMLExportWord, words)
+    db_add_objects(Type, types)
+    db_add_objects(Author, authors)
+    db_add_objects(Key, keys)
+    db_add_objects(Definition, definitions)
+    db_add_objects(Event, all_events)
+    db_connect_authors(connect_authors)
+    db_connect_words(connect_words)
+    db_connect_keys(connect_keys)
+
+    normal = HTMLExportWord.html_all_by_name("pru*", style="normal")
+    result = HTMLExportWord.html_all_by_name("pru*", style=custom_style.name)
+    assert "<b>prukao</b>" in result
+    assert result == normal.replace('<a class="m_cpx">prukao</a>', "<b>prukao</b>")
+
+    assert HTMLExportWord.translation_by_key("test", style=custom_style.name) == \
+           HTMLExportWord.translation_by_key("test", style="normal")
@@ -4,7 +4,9 @@
 """HTML Model unit tests."""
 
 import pytest
+from sqlalchemy import event
 
+from loglan_db import db
 from loglan_db.model import Type, Author, Key, Event
 from loglan_db.model_html.html_word import HTMLExportWord, Meaning
 from loglan_db.model_html.html_definition import HTMLExportDefinition as Definition
@@ -50,6 +52,35 @@ class TestDefinition:
 
         assert result == "K <k>test</k>/examine B for P with test V."
 
+    @pytest.mark.parametrize("word, case_sensitive, expected", [
+        ("Test", False, "<k>test</k>, <k>Test</k>, tests, a@b, <l>x</l>"),
+        ("Test", True, "test, <k>Test</k>, tests, a@b, <l>x</l>"),
+        ("test*", False, "<k>test</k>, <k>Test</k>, <k>tests</k>, a@b, <l>x</l>"),
+        ("*", False, "<k>test</k>, <k>Test</k>, <k>tests</k>, a@b, <l>x</l>"),
+        ("a*", False, "test, Test, tests, a@b, <l>x</l>"),
+        ("x", False, "test, Test, tests, a@b, <l>x</l>"),
+    ])
+    def test_highlight_key_patterns(self, word, case_sensitive, expected):
+        """
+        Test highlighting keys with wildcards, case sensitivity
+        and keys, which could not be highlighted.
+        """
+        def_body = Definition.format_body("«test», «Test», «tests», «a@b», {x}")
+        assert Definition.highlight_key(def_body, word, case_sensitive) == expected
+
+    @pytest.mark.parametrize("word, expected", [
+        ("(be", "<k>(be</k>, a.m., abm., c++, c"),
+        ("a.m.", "(be, <k>a.m.</k>, abm., c++, c"),
+        ("c++", "(be, a.m., abm., <k>c++</k>, c"),
+        ("c+*", "(be, a.m., abm., <k>c++</k>, c"),
+    ])
+    def test_highlight_key_metacharacters(self, word, expected):
+        """
+        Test highlighting keys with regex metacharacters, which are matched literally.
+        """
+        def_body = Definition.format_body("«(be», «a.m.», «abm.», «c++», «c»")
+        assert Definition.highlight_key(def_body, word) == expected
+
     def test_export_for_english(self):
         """Test exporting definition as HTML block for E-L Dictionary"""
         db_add_objects(Word, words)
@@ -312,6 +343,31 @@ class TestWord:
         result = Word.html_all_by_name("Pru*", style="normal", case_sensitive=False)
         assert result == expected_result_normal
 
+    def test_html_all_by_name_prefetch(self):
+        db_add_objects(Word, words)
+        db_add_objects(Type, types)
+        db_add_objects(Author, authors)
+        db_add_objects(Event, events)
+        db_add_objects(Definition, definitions)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            for style in ("normal", "ultra"):
+                statements.clear()
+                expected = Word.html_all_by_name("pru*", style=style, prefetch=False)
+                lazy_count = len(statements)
+
+                statements.clear()
+                assert Word.html_all_by_name("pru*", style=style) == expected
+                assert len(statements) < lazy_count
+                assert len(statements) <= 6
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
     def test_translation_by_key(self):
         db_add_objects(Word, words)
         db_add_objects(Type, types)
@@ -342,3 +398,54 @@ class TestWord:
 
         result = Word.translation_by_key("word_that_does_not_exist")
         assert result is None
+
+    def test_iter_html_results(self):
+        db_add_objects(Word, words)
+        db_add_objects(Type, types)
+        db_add_objects(Author, authors)
+        db_add_objects(Key, keys)
+        db_add_objects(Definition, definitions)
+        db_add_objects(Event, all_events)
+
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+        db_connect_keys(connect_keys)
+
+        for style in ("normal", "ultra"):
+            for batch_size in (1, 2, 500):
+                fragments = list(Word.iter_html_all_by_name("*", style=style, batch_size=batch_size))
+                assert len(fragments) > 2
+                assert "".join(fragments) == Word.html_all_by_name("*", style=style)
+
+                fragments = list(Word.iter_translation_by_key("*t*", style=style, batch_size=batch_size))
+                assert len(fragments) > 1
+                assert "".join(fragments) == Word.translation_by_key("*t*", style=style)
+
+        event = Event.get_by_id(1)
+        assert "".join(Word.iter_html_all_by_name("pru*", event_id=event)) == \
+               Word.html_all_by_name("pru*", event_id=event) == Word.html_all_by_name("pru*", event_id=1)
+        assert not list(Word.iter_html_all_by_name("word_that_does_not_exist"))
+        assert not list(Word.iter_translation_by_key("word_that_does_not_exist"))
+
+    def test_translation_by_key_batched(self):
+        db_add_objects(Word, words)
+        db_add_objects(Type, types)
+        db_add_objects(Key, keys)
+        db_add_objects(Definition, definitions)
+        db_add_objects(Event, all_events)
+        db_connect_keys(connect_keys)
+        Event.latest_id()
+
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            for key, style in (("test", "ultra"), ("Test*", "normal"), ("*amin*", "ultra")):
+                expected = "\n".join(word.definitions_by_key(key.lower(), style)
+                                     for word in Word.by_key(key).all()).strip()
+
+                statements.clear()
+                assert Word.translation_by_key(key, style=style) == expected
+                assert len(statements) == 1
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
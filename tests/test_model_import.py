@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903
+
+"""Import Model unit tests."""
+
+import re
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from loglan_db.model_db.base_connect_tables import t_connect_keys, t_connect_words
+from loglan_db.model_export import ExportAuthor as Author, ExportEvent as Event, \
+    ExportSyllable as Syllable, ExportSetting as Setting, ExportType as Type, \
+    ExportWord as Word, ExportDefinition as Definition, ExportWordSpell as WordSpell
+from loglan_db.model_export import export_models_pg, export_to_files
+from loglan_db.model_import import import_from_files, link_all_keys, id_sequence_statement
+from loglan_db.model_db.base_key import BaseKey
+from tests.data import author_1, event_1, syllable_35, setting_1, type_1, word_5, definition_1
+from tests.data import connect_authors, connect_words, keys, connect_keys
+from tests.data import definitions, words, types, authors, events, settings, syllables
+from tests.functions import db_add_and_return, db_add_objects, \
+    db_connect_authors, db_connect_words, db_connect_keys
+
+
+@pytest.mark.usefixtures("db")
+class TestImport:
+    """import_() tests."""
+    def test_import_is_reverse_of_export(self):
+        """Test that import_() restores values of export()"""
+        for model, data in [
+                (Author, author_1), (Event, event_1), (Syllable, syllable_35),
+                (Setting, setting_1), (Type, type_1), ]:
+            obj = db_add_and_return(model, data)
+            result = model.import_(obj.export())
+            assert result == {key: data[key] for key in result}
+
+    def test_import_word(self):
+        """Test Word.import_() method"""
+        result = Word.import_("9983@Afx@Affix@@@JCB (?)@1988 (?)@7+?@ka(kt)o@@@")
+        assert result["id_old"] == word_5["id_old"]
+        assert result["authors"] == ["JCB", ]
+        assert result["notes"] == word_5["notes"]
+        assert result["year"] == word_5["year"]
+        assert result["rank"] == word_5["rank"]
+        assert result["used_in"] == []
+        assert result["TID_old"] is None
+
+    def test_import_definition(self):
+        """Test Definition.import_() method"""
+        result = Definition.import_("7191@1@@4v@K «test»/«examine» B for P with test V.@@K-BPV")
+        assert result["word_id_old"] == 7191
+        assert result["slots"] == definition_1["slots"]
+        assert result["grammar_code"] == definition_1["grammar_code"]
+        assert result["body"] == definition_1["body"]
+        assert result["case_tags"] == definition_1["case_tags"]
+
+    def test_definition_round_trip(self):
+        """Test that a definition row is restored by import_() after export()"""
+        db_add_objects(Word, words)
+        data = {**definition_1, "usage": None, "grammar_code": None, "slots": None,
+                "case_tags": None, "notes": "From an old edition"}
+        definition = db_add_and_return(Definition, data)
+
+        result = Definition.import_(definition.export())
+        assert result.pop("word_id_old") == definition.source_word.id_old
+        assert result == {key: data[key] for key in result}
+
+        definition.case_tags, definition.usage = "K-BPV", "po %"
+        result = Definition.import_(definition.export())
+        assert (result["case_tags"], result["usage"]) == ("K-BPV", "po %")
+
+    def test_id_sequence_statement(self):
+        """Test the statement, which moves PostgreSQL id sequence"""
+        sql = str(id_sequence_statement(Event.__table__).compile(dialect=postgresql.dialect()))
+        assert "setval(pg_get_serial_sequence(" in sql
+        assert "max(events.id)" in sql
+
+    def test_import_word_spell(self):
+        """Test WordSpell.import_() method"""
+        result = WordSpell.import_("7191@prukao@prukao@555555@1@9999@")
+        assert result == {"id_old": 7191, "name": "prukao",
+                          "event_start_id": 1, "event_end_id": None}
+
+
+@pytest.mark.usefixtures("db")
+class TestImportFromFiles:
+    """Bulk import tests."""
+    def test_import_from_files(self, db, tmp_path):
+        """Test that exported dictionary is imported back without changes"""
+        db_add_objects(Word, words)
+        db_add_objects(Author, authors)
+        db_add_objects(Type, types)
+        db_add_objects(Event, events)
+        db_add_objects(Setting, settings)
+        db_add_objects(Syllable, syllables)
+        db_add_objects(Definition, definitions)
+        db_connect_authors(connect_authors)
+        db_connect_words(connect_words)
+        export_to_files(str(tmp_path / "before"))
+
+        db.session.close()
+        db.drop_all()
+        db.create_all()
+
+        result = import_from_files(str(tmp_path / "before"))
+        export_to_files(str(tmp_path / "after"))
+
+        for model in export_models_pg:
+            file_name = f"{model.__tablename__}.txt"
+            before = (tmp_path / "before" / file_name).read_text(encoding="utf-8")
+            after = (tmp_path / "after" / file_name).read_text(encoding="utf-8")
+            assert before == after
+
+        assert result["words"] == len(words)
+        assert result["definitions"] == len(definitions)
+        assert result["connect_authors"] == len(connect_authors)
+        assert result["connect_words"] == len(connect_words)
+        assert result["keys"] == BaseKey.query.count() == 11
+        assert result["connect_keys"] == db.session.query(t_connect_keys).count() == 21
+
+        word = Word.query.filter(Word.id_old == 7190).first()
+        assert [d.keys.count() for d in word.definitions] == [2, 1, 1, 1]
+        assert db.session.query(t_connect_words).count() == len(connect_words)
+
+
+@pytest.mark.usefixtures("db")
+class TestLinkAllKeys:
+    """Bulk key linking tests."""
+    def test_link_all_keys(self, db):
+        """Test that missing keys and links are created and existing ones are kept"""
+        db_add_objects(Definition, definitions)
+        db_add_objects(BaseKey, keys[2:])
+        kept_ids = {key["id"] for key in keys[2:]}
+        db_connect_keys([(kid, did) for kid, did in connect_keys if kid in kept_ids])
+
+        def links():
+            return {(BaseKey.get_by_id(kid).word, did)
+                    for kid, did in db.session.query(t_connect_keys)}
+
+        links_before = links()
+        expected = {(word, definition["id"]) for definition in definitions
+                    for word in re.findall(Definition.KEY_PATTERN, definition["body"])}
+        expected_keys = {word for word, _ in expected} - {key["word"] for key in keys[2:]}
+
+        result = link_all_keys(definition_ids=[13527, 13531], batch_size=1)
+        assert links() == links_before | {
+            link for link in expected if link[1] in (13527, 13531)}
+
+        result_all = link_all_keys(batch_size=2)
+        assert links() == links_before | expected
+        assert result["keys"] + result_all["keys"] == len(expected_keys) > 0
+        assert result["links"] + result_all["links"] == len(links()) - len(links_before)
+        assert BaseKey.query.count() == len(keys[2:]) + len(expected_keys)
+
+        assert link_all_keys() == {"keys": 0, "links": 0}
@@ -8,7 +8,8 @@ import pytest
 from loglan_db.model import Word
 from tests.data import word_1, words
 from tests.functions import db_add_and_return, db_add_object, db_add_objects
-from loglan_db.model_init import InitBase
+from loglan_db import db
+from loglan_db.model_init import InitBase, DBBase, create_missing_indexes
 
 
 @pytest.mark.usefixtures("db")
@@ -62,6 +63,43 @@ class TestDBBase:
         w = db_add_and_return(Word, word_1)
         assert w.delete() is None
 
+    def test_batch(self):
+        with DBBase.batch(size=4) as batch:
+            db_add_objects(Word, words)
+            assert Word.query.count() == 6
+
+            w = Word.get_by_id(word_1.get("id"))
+            w.update({'name': 'test', })
+            w.delete()
+
+            with DBBase.batch() as inner_batch:
+                assert inner_batch is batch
+
+        assert batch.count == 8
+        assert Word.query.count() == 5
+        assert Word.get_by_id(word_1.get("id")) is None
+
+    def test_batch_rollback(self):
+        with pytest.raises(ValueError):
+            with DBBase.batch(size=2) as batch:
+                db_add_objects(Word, words)
+                raise ValueError
+
+        assert batch.count == 6
+        assert Word.query.count() == 0
+
+        db_add_objects(Word, words)
+        assert Word.query.count() == 6
+
+    def test_create_missing_indexes(self):
+        assert create_missing_indexes() == []
+
+        db.session.execute("DROP INDEX ix_words_name_lower")
+        db.session.execute("DROP INDEX ix_connect_keys_DID")
+        db.session.commit()
+        assert sorted(create_missing_indexes()) == ["ix_connect_keys_DID", "ix_words_name_lower"]
+        assert create_missing_indexes() == []
+
     def test_get_all(self):
         db_add_objects(Word, words)
         words_from_db = Word.get_all()
@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=R0201, R0903, C0116
+
+"""Snapshot unit tests."""
+
+import pytest
+
+from loglan_db.model_db.base_author import BaseAuthor as Author
+from loglan_db.model_db.base_definition import BaseDefinition as Definition
+from loglan_db.model_db.base_event import BaseEvent as Event
+from loglan_db.model_db.base_key import BaseKey as Key
+from loglan_db.model_db.base_setting import BaseSetting as Setting
+from loglan_db.model_db.base_type import BaseType as Type
+from loglan_db.model_db.base_word import BaseWord
+from loglan_db.model_db.addons.addon_word_getter import AddonWordGetter
+from loglan_db.model_snapshot import DictionarySnapshot, WildcardIndex, like_to_regex
+from tests.data import changed_words, all_events, connect_keys, connect_words, connect_authors
+from tests.data import keys, definitions, words, types, authors, settings
+from tests.functions import db_add_objects, db_connect_keys, db_connect_words, db_connect_authors
+
+
+class Word(BaseWord, AddonWordGetter):
+    """BaseWord class with Getter addon"""
+
+
+def names(result):
+    return [(word.id, word.name) for word in result]
+
+
+@pytest.mark.usefixtures("db")
+class TestSnapshot:
+    """DictionarySnapshot tests."""
+
+    def fill(self):
+        db_add_objects(Word, changed_words + words)
+        db_add_objects(Definition, definitions)
+        db_add_objects(Key, keys)
+        db_add_objects(Event, all_events)
+        db_add_objects(Type, types)
+        db_add_objects(Author, authors)
+        db_add_objects(Setting, settings)
+        db_connect_keys(connect_keys)
+        db_connect_words(connect_words)
+        db_connect_authors(connect_authors)
+
+    def test_same_as_db(self):
+        self.fill()
+        snapshot = DictionarySnapshot()
+
+        for event_id in (None, 1, 5):
+            assert names(snapshot.by_event(event_id)) == names(Word.by_event(event_id).all())
+
+        for name in ("prukao", "PRUKAO", "pru*", "%ao", "pr_", "zzz", "*KAO", "p*o", "*uka*", "*u*"):
+            assert names(snapshot.by_name(name)) == names(Word.by_name(name).all())
+
+        for key, language in (("test", None), ("Test", "en"), ("test", "es"), ("tes*", None)):
+            assert names(snapshot.by_key(key, language=language)) == \
+                   names(Word.by_key(key, language=language).all())
+
+    def test_relations(self):
+        self.fill()
+        snapshot = DictionarySnapshot()
+        word = Word.get_by_id(3813)
+
+        assert [d.id for d in snapshot.definitions(word.id)] == \
+               [d.id for d in word.definitions.order_by(Definition.position)]
+        assert sorted(a.abbreviation for a in snapshot.authors(word.id)) == \
+               sorted(a.abbreviation for a in word.authors)
+        assert names(snapshot.derivatives(word.id)) == \
+               names(word.derivatives.order_by(BaseWord.name))
+        assert snapshot.type(word.id).type == word.type.type
+        assert [k.word for k in snapshot.keys(13527)] == \
+               [k.word for k in Definition.get_by_id(13527).keys]
+
+    def test_reload_on_db_version(self):
+        self.fill()
+        snapshot = DictionarySnapshot(check_interval=0)
+        assert snapshot.by_name("prukao")
+        assert snapshot.db_version == settings[0]["db_version"]
+
+        Word.get_by_id(7316).update({"name": "prukaoa"})
+        assert snapshot.by_name("prukao")
+
+        setting = Setting.get_by_id(settings[0]["id"])
+        setting.db_version += 1
+        setting.save()
+        assert not snapshot.by_name("prukao")
+        assert snapshot.db_version == settings[0]["db_version"] + 1
+
+    def test_manual_refresh(self):
+        self.fill()
+        snapshot = DictionarySnapshot(check_interval=None)
+        assert snapshot.info()["words"] == 0
+        assert snapshot.by_name("prukao")
+        assert snapshot.info()["words"] == len(changed_words + words)
+
+        Word.get_by_id(7316).update({"name": "prukaoa"})
+        assert snapshot.refresh() is snapshot.data
+        assert snapshot.by_name("prukao")
+        snapshot.reload()
+        assert not snapshot.by_name("prukao")
+
+
+@pytest.mark.parametrize("pattern, value, case_sensitive, expected", [
+    ("pru*", "PRUKAO", False, True),
+    ("pru*", "PRUKAO", True, False),
+    ("p_u", "pru", True, True),
+    ("a.b", "axb", False, False),
+    ("100%", "100 percent", False, True),
+])
+def test_like_to_regex(pattern, value, case_sensitive, expected):
+    assert bool(like_to_regex(pattern, case_sensitive).fullmatch(value)) is expected
+
+
+INDEX_VALUES = ["Ona", "bona", "blanu", "blabla", "Blanu", "kaona", "o", "ab_c", "abXc"]
+
+
+@pytest.mark.parametrize("pattern", [
+    "bla*", "*ona", "*ON*", "b*a", "*", "o", "ONA", "*lab*", "_ona", "b_ona", "ab_c", "a%c", "zz*", "*zz",
+])
+@pytest.mark.parametrize("case_sensitive", [False, True])
+def test_wildcard_index(pattern, case_sensitive):
+    index = WildcardIndex()
+    for item_id, value in enumerate(INDEX_VALUES):
+        index.add(value, item_id)
+    index.build()
+
+    regex = like_to_regex(pattern, case_sensitive)
+    expected = [item_id for item_id, value in enumerate(INDEX_VALUES) if regex.fullmatch(value)]
+    assert sorted(index.search(pattern, case_sensitive)) == expected